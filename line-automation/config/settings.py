@@ -5,7 +5,7 @@
 
 import random
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # =============================================================================
 # パス設定
@@ -17,6 +17,9 @@ BASE_DIR = Path(__file__).parent.parent
 # 設定ファイルディレクトリ
 CONFIG_DIR = BASE_DIR / "config"
 
+# UI用の画像などのリソースディレクトリ
+ASSETS_DIR = BASE_DIR / "assets"
+
 # セッションファイル
 SESSION_FILE = CONFIG_DIR / "session.json"
 
@@ -34,6 +37,7 @@ GOOGLE_CREDENTIALS_FILE = CONFIG_DIR / "google_credentials.json"
 LINE_MANAGER_URL = "https://manager.line.biz/"
 
 # LINEログインURL（リダイレクト付き）
+# 隣接する文字列リテラルはコンパイル時に1つの定数へ結合される（f文字列や+での連結は加えないこと）
 LINE_LOGIN_URL = (
     "https://account.line.biz/login?redirectUri="
     "https%3A%2F%2Faccount.line.biz%2Foauth2%2Fcallback%3F"
@@ -53,7 +57,7 @@ LINE_ENTRY_URL = "https://entry.line.biz/form/entry/unverified"
 # =============================================================================
 
 # 一般的なユーザーエージェント（Windows/Mac Chrome）
-USER_AGENTS: List[str] = [
+USER_AGENTS: Tuple[str, ...] = (
     # Windows Chrome
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
@@ -62,16 +66,16 @@ USER_AGENTS: List[str] = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-]
+)
 
 # 一般的な画面解像度
-SCREEN_RESOLUTIONS: List[Tuple[int, int]] = [
+SCREEN_RESOLUTIONS: Tuple[Tuple[int, int], ...] = (
     (1920, 1080),  # Full HD（最も一般的）
     (1366, 768),   # ノートPC
     (1536, 864),   # スケーリング適用
     (1440, 900),   # MacBook
     (2560, 1440),  # WQHD
-]
+)
 
 # デフォルトビューポートサイズ
 DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
@@ -97,10 +101,27 @@ ACTION_DELAY_MAX = 1500  # 1.5秒
 TYPING_DELAY_MIN = 20   # 20ms
 TYPING_DELAY_MAX = 100  # 100ms
 
+# まとめて入力する文字数（この範囲でランダムに区切り、区切りごとにディレイを変える）
+TYPING_BURST_MIN = 2
+TYPING_BURST_MAX = 5
+
+# 上記の秒単位の値（asyncio.sleepにそのまま渡す用）
+ACTION_DELAY_MIN_S = ACTION_DELAY_MIN / 1000
+ACTION_DELAY_MAX_S = ACTION_DELAY_MAX / 1000
+TYPING_DELAY_MIN_S = TYPING_DELAY_MIN / 1000
+TYPING_DELAY_MAX_S = TYPING_DELAY_MAX / 1000
+
 # マウス移動のステップ数
 MOUSE_MOVE_STEPS_MIN = 20
 MOUSE_MOVE_STEPS_MAX = 40
 
+# 短い移動でのステップ数の下限と、1ステップあたりの移動距離の目安（ピクセル）
+MOUSE_MOVE_STEPS_SHORT = 6
+MOUSE_PIXELS_PER_STEP = 15
+
+# 目標までの距離（ピクセル、縦横の合計）がこれ未満ならベジェ曲線を使わず直接移動
+MOUSE_DIRECT_MOVE_DISTANCE = 8
+
 # ベジェ曲線の制御点オフセット（ピクセル）
 BEZIER_CONTROL_OFFSET = 50
 
@@ -114,9 +135,22 @@ BROWSER_ARGS: List[str] = [
     '--no-sandbox',
     '--disable-setuid-sandbox',
     '--disable-infobars',
-    '--window-size=1920,1080',
     '--start-maximized',
-]
+]  # ウィンドウサイズは起動時に get_browser_args で付与
+
+# 読み込みを止めるURL（計測・広告）
+# ルートを登録したリクエストはHTTPキャッシュが効かなくなるため、対象は必要なURLだけに絞る
+BLOCKED_URL_PATTERNS: Tuple[str, ...] = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+)
+
+# 読み込みを止める画像の拡張子（自動化では表示内容を見ないため。アイコン等のsvgは止めない）
+BLOCKED_IMAGE_EXTENSIONS: Tuple[str, ...] = ('png', 'jpg', 'jpeg', 'gif', 'webp')
+
+# 画像の停止に関わらず読み込むURL（手動で解くCAPTCHAの画像など）
+ALLOWED_URL_PATTERNS: Tuple[str, ...] = ('recaptcha',)
 
 # =============================================================================
 # スプレッドシート設定
@@ -129,7 +163,7 @@ MAX_ACCOUNTS = 100
 HEADER_ROWS = 2
 
 # 有効判定に使用する値
-ENABLED_VALUES = ['TRUE', '1', 'はい', 'YES', '有効']
+ENABLED_VALUES: Tuple[str, ...] = ('TRUE', '1', 'はい', 'YES', '有効')
 
 # =============================================================================
 # アカウント作成設定
@@ -141,6 +175,18 @@ CATEGORY_GROUP = '71'
 # 小業種（ウェブサービス(エンターテインメント)）
 CATEGORY = '595'
 
+# UIからの通知がない場合にCAPTCHAの手動認証を待つ最大時間（秒）
+CAPTCHA_WAIT_TIMEOUT = 120
+
+# 同時に処理するアカウント数（1つのブラウザ内で開くコンテキストの数）
+PARALLEL = 4
+
+# アカウント処理の開始間隔の最小値（秒）
+MIN_ACCOUNT_SPACING = 2.0
+
+# 不要なタブをまとめて閉じる間隔（アカウント数。開いているタブがこの数を超えた場合も閉じる）
+TAB_CLEANUP_INTERVAL = 5
+
 # =============================================================================
 # ヘルパー関数
 # =============================================================================
@@ -161,16 +207,28 @@ def get_viewport_size() -> Dict[str, int]:
     return {"width": width, "height": height}
 
 
-def get_random_action_delay() -> float:
+def get_browser_args(width: int, height: int) -> List[str]:
+    """ビューポートに合わせたウィンドウサイズ付きのブラウザ起動引数を取得"""
+    return BROWSER_ARGS + [f'--window-size={width},{height}']
+
+
+# 以下の rng には呼び出し側の random.Random を渡せる（省略時はモジュール全体の乱数を使う）
+
+def get_random_action_delay(rng: Optional[random.Random] = None) -> float:
     """ランダムなアクション待機時間を取得（秒）"""
-    return random.randint(ACTION_DELAY_MIN, ACTION_DELAY_MAX) / 1000
+    return (rng or random).uniform(ACTION_DELAY_MIN_S, ACTION_DELAY_MAX_S)
 
 
-def get_random_typing_delay() -> float:
+def get_random_typing_delay(rng: Optional[random.Random] = None) -> float:
     """ランダムなタイピング待機時間を取得（秒）"""
-    return random.randint(TYPING_DELAY_MIN, TYPING_DELAY_MAX) / 1000
+    return (rng or random).uniform(TYPING_DELAY_MIN_S, TYPING_DELAY_MAX_S)
+
+
+def get_random_typing_burst(rng: Optional[random.Random] = None) -> int:
+    """ランダムなまとめて入力する文字数を取得"""
+    return (rng or random).randint(TYPING_BURST_MIN, TYPING_BURST_MAX)
 
 
-def get_random_mouse_steps() -> int:
+def get_random_mouse_steps(rng: Optional[random.Random] = None) -> int:
     """ランダムなマウス移動ステップ数を取得"""
-    return random.randint(MOUSE_MOVE_STEPS_MIN, MOUSE_MOVE_STEPS_MAX)
+    return (rng or random).randint(MOUSE_MOVE_STEPS_MIN, MOUSE_MOVE_STEPS_MAX)
@@ -4,12 +4,19 @@
 """
 
 import asyncio
+import time
 from typing import Optional, Callable, List, Dict
 from dataclasses import dataclass
 
+try:
+    import uvloop  # 任意依存（Linux/macOSのみ。インストールされていれば高速なイベントループを使う）
+except ImportError:
+    uvloop = None
+
+from config.settings import PARALLEL, MIN_ACCOUNT_SPACING
 from .sheets_client import SheetsClient, AccountRow
 from .image_downloader import ImageDownloader
-from .line_automation import LineAutomation, AutomationResult
+from .line_automation import LineAutomationPool, AutomationResult
 
 
 @dataclass
@@ -23,6 +30,8 @@ class RunnerConfig:
     headless: bool = False
     biz_manager_enabled: bool = False
     biz_manager_name: str = ""
+    max_concurrency: int = PARALLEL  # 同時に処理するアカウント数
+    min_spacing_sec: float = MIN_ACCOUNT_SPACING  # アカウント処理の開始間隔の最小値（秒）
     
     # 列設定
     col_enabled: str = ""
@@ -53,6 +62,7 @@ class AutomationRunner:
             on_captcha_required: CAPTCHA検知時のコールバック
         """
         self.config = config
+        self._column_config = self.get_column_config()  # 実行中は変わらないため1回だけ作成
         self.on_status_update = on_status_update or (lambda x: print(x))
         self.on_progress_update = on_progress_update or (lambda c, t: None)
         self.on_captcha_required = on_captcha_required
@@ -63,7 +73,10 @@ class AutomationRunner:
         
         self.sheets_client: Optional[SheetsClient] = None
         self.image_downloader: Optional[ImageDownloader] = None
-        self.automation: Optional[LineAutomation] = None
+        self.pool: Optional[LineAutomationPool] = None  # 並列処理用のブラウザコンテキスト
+        self._completed = 0  # 処理済みアカウント数
+        self._last_start = 0.0  # 直前にアカウント処理を開始した時刻（time.monotonic）
+        self._start_lock: Optional[asyncio.Lock] = None
         
         self.accounts: List[AccountRow] = []
         self.results: List[AutomationResult] = []
@@ -72,6 +85,14 @@ class AutomationRunner:
         """ステータスログ"""
         self.on_status_update(message)
     
+    async def _wait_for_spacing(self):
+        """前回の開始から min_spacing_sec 経っていなければ、その分だけ待つ"""
+        async with self._start_lock:
+            to_wait = self.config.min_spacing_sec - (time.monotonic() - self._last_start)
+            if to_wait > 0:
+                await asyncio.sleep(to_wait)
+            self._last_start = time.monotonic()
+    
     def get_column_config(self) -> Dict[str, str]:
         """列設定を辞書で取得"""
         return {
@@ -95,6 +116,8 @@ class AutomationRunner:
         self.is_running = True
         self.should_stop = False
         self.results = []
+        tasks: List[asyncio.Task] = []
+        download_task: Optional[asyncio.Task] = None
         
         try:
             # ===== 前処理フロー =====
@@ -112,20 +135,19 @@ class AutomationRunner:
             
             # 有効な行を取得
             self.log("有効なアカウントを取得中...")
-            self.accounts = self.sheets_client.get_enabled_rows(self.get_column_config())
+            self.accounts = await asyncio.to_thread(
+                self.sheets_client.get_enabled_rows, self._column_config
+            )
             self.log(f"✓ {len(self.accounts)}件のアカウントを検出")
             
             if not self.accounts:
                 self.log("処理対象のアカウントがありません")
                 return []
             
-            # 画像をダウンロード
-            self.log("アイコン画像をダウンロード中...")
+            # 画像のダウンロードはブラウザ起動・ログインと並行して進める
+            self.log("アイコン画像のダウンロードを開始...")
             self.image_downloader = ImageDownloader(self.config.icon_save_path)
-            download_results, row_to_image = self.image_downloader.download_all(self.accounts)
-            
-            success_count = sum(1 for r in download_results if r.success)
-            self.log(f"✓ 画像ダウンロード完了: {success_count}/{len(download_results)}件")
+            download_task = asyncio.create_task(self.image_downloader.download_all_async(self.accounts))
             
             # ===== アカウント作成処理 =====
             self.log("")
@@ -133,59 +155,82 @@ class AutomationRunner:
             self.log("【アカウント作成処理】開始")
             self.log("=" * 50)
             
-            # ブラウザ起動
-            biz_manager_name = self.config.biz_manager_name if self.config.biz_manager_enabled else ""
-            self.automation = LineAutomation(
+            # ブラウザ起動・ログイン（ブラウザは1つだけ起動し、ログイン状態を各コンテキストに引き継ぐ）
+            total = len(self.accounts)
+            self.pool = LineAutomationPool(
                 email=self.config.email,
                 password=self.config.password,
                 headless=self.config.headless,
-                biz_manager_name=biz_manager_name,
+                biz_manager_name=self.config.biz_manager_name if self.config.biz_manager_enabled else "",
                 on_status_update=self.log,
                 on_captcha_required=self.on_captcha_required
             )
+            started = await self.pool.start(max(1, min(self.config.max_concurrency, total)))
             
-            if not await self.automation.start():
-                self.log("✗ ブラウザ起動失敗")
-                return []
+            # 最初のアカウント処理の前にダウンロードの完了を待つ
+            download_results, row_to_image = await download_task
+            success_count = sum(1 for r in download_results if r.success)
+            self.log(f"✓ 画像ダウンロード完了: {success_count}/{len(download_results)}件")
             
-            # ログイン
-            if not await self.automation.login():
-                self.log("✗ ログイン失敗")
-                await self.automation.stop()
+            if not started:
                 return []
+            self.log(f"✓ {len(self.pool.automations)}個のコンテキストで並列処理します")
             
-            # 各アカウントを処理
-            total = len(self.accounts)
-            for idx, account in enumerate(self.accounts):
-                # 停止チェック
-                if self.should_stop:
-                    self.log("処理が中断されました")
-                    break
-                
-                # 一時停止チェック
-                while self.is_paused:
-                    await asyncio.sleep(1)
+            # 空いているコンテキストを借りて、コンテキスト数まで同時に処理する
+            async def process(idx: int, account: AccountRow) -> Optional[AutomationResult]:
+                try:
+                    return await process_one(idx, account)
+                except Exception as e:
+                    # 1件の失敗で他のアカウントの処理を止めないよう、失敗した結果として扱う
+                    self.log(f"✗ 行{account.row_number}の処理エラー: {e}")
+                    return AutomationResult(row_number=account.row_number, success=False, error_message=str(e))
+            
+            async def process_one(idx: int, account: AccountRow) -> Optional[AutomationResult]:
+                async with self.pool.acquire() as automation:
+                    # 一時停止チェック
+                    while self.is_paused and not self.should_stop:
+                        await asyncio.sleep(1)
+                    
+                    # 停止チェック
                     if self.should_stop:
-                        break
-                
-                self.on_progress_update(idx + 1, total)
-                self.log("")
-                self.log(f"--- アカウント {idx + 1}/{total} ---")
-                
-                # 画像パスを取得
-                image_path = row_to_image.get(account.row_number, "")
-                
-                # アカウント処理
-                result = await self.automation.process_account(
-                    account=account,
-                    image_path=image_path,
-                    sheet_reader=self.sheets_client,
-                    column_config=self.get_column_config()
-                )
-                self.results.append(result)
-                
-                # 処理間の待機
-                await asyncio.sleep(2)
+                        return None
+                    
+                    self.log("")
+                    self.log(f"--- アカウント {idx + 1}/{total} ---")
+                    
+                    # 画像パスを取得
+                    image_path = row_to_image.get(account.row_number, "")
+                    
+                    # 開始間隔を空ける（直前のアカウントの処理中に待ち終わっていれば待たない）
+                    await self._wait_for_spacing()
+                    
+                    # アカウント処理
+                    result = await automation.process_account(
+                        account=account,
+                        image_path=image_path,
+                        sheet_reader=self.sheets_client,
+                        column_config=self._column_config
+                    )
+                    return result
+            
+            # 各アカウントを処理し、終わったものから進捗を通知
+            self._completed = 0
+            self._last_start = 0.0
+            self._start_lock = asyncio.Lock()
+            tasks = [
+                asyncio.create_task(process(idx, account))
+                for idx, account in enumerate(self.accounts)
+            ]
+            for finished in asyncio.as_completed(tasks):
+                if await finished is not None:
+                    self._completed += 1
+                    self.on_progress_update(self._completed, total)
+            
+            # 結果は行の順番を保つ
+            self.results = [r for r in (t.result() for t in tasks) if r is not None]
+            
+            if self.should_stop:
+                self.log("処理が中断されました")
             
             # 完了
             self.log("")
@@ -200,9 +245,17 @@ class AutomationRunner:
             self.log(f"✗ 実行エラー: {e}")
         
         finally:
-            # クリーンアップ
-            if self.automation:
-                await self.automation.stop()
+            # クリーンアップ（処理中のタスクを止めてからコンテキストを閉じる）
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if download_task is not None:
+                # ブラウザ起動・ログインで失敗した場合はダウンロードが終わっていないため止める
+                download_task.cancel()
+                await asyncio.gather(download_task, return_exceptions=True)
+            if self.pool:
+                await self.pool.stop()
+                self.pool = None
             self.is_running = False
         
         return self.results
@@ -224,6 +277,13 @@ class AutomationRunner:
         self.log("停止リクエストを受信しました")
 
 
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """自動化の実行に使うイベントループを作成（uvloopがあればuvloopのループ）"""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
 def run_automation_sync(
     config: RunnerConfig,
     on_status_update: Optional[Callable[[str], None]] = None,
@@ -249,4 +309,8 @@ def run_automation_sync(
         on_captcha_required=on_captcha_required
     )
     
-    return asyncio.run(runner.run())
+    loop = new_event_loop()
+    try:
+        return loop.run_until_complete(runner.run())
+    finally:
+        loop.close()
@@ -5,12 +5,74 @@ Dropboxリンクから画像をダウンロードし、ローカルに保存
 
 import os
 import re
+import sys
+import asyncio
 import hashlib
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .json_io import read_json, write_json
+
+
+# ファイル書き込み時のチャンクサイズ（1MiB）
+_CHUNK_SIZE = 1024 * 1024
+
+# URL解析用の正規表現（コンパイル済み）
+_FILENAME_RE = re.compile(r'/([^/]+\.(jpg|jpeg|png|gif|webp))', re.IGNORECASE)
+_QUERY_RE = re.compile(r'\?.*$')
+_DROPBOX_HOST_RE = re.compile(r'^(https?://)(?:www\.)?dropbox\.com/', re.IGNORECASE)
+
+
+def _write_all(fd: int, data: bytes):
+    """os.writeの部分書き込みを考慮してすべて書き込む"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+@functools.lru_cache(maxsize=4096)
+def _convert_dropbox_url(url: str) -> str:
+    """
+    DropboxのURLを直接ダウンロード可能なURLに変換
+    
+    Args:
+        url: 元のDropbox URL
+        
+    Returns:
+        ダウンロード可能なURL
+    """
+    # dl=0 を dl=1 に変更してダウンロードリンクにする
+    if 'dropbox.com' in url:
+        # www.dropbox.com / dropbox.com を dl.dropboxusercontent.com に変更
+        # （共有ページ経由の302リダイレクトを挟まず直接取得する）
+        url = _DROPBOX_HOST_RE.sub(r'\1dl.dropboxusercontent.com/', url)
+        url = url.replace('?dl=0', '?dl=1')
+        # クエリパラメータを整理
+        if '&dl=0' in url:
+            url = url.replace('&dl=0', '&dl=1')
+        elif 'dl=0' not in url and 'dl=1' not in url:
+            if '?' in url:
+                url += '&dl=1'
+            else:
+                url += '?dl=1'
+    return url
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_url(url: str) -> str:
+    """URLを正規化（重複チェック用）"""
+    # クエリパラメータを除いた基本部分を取得
+    base_url = _QUERY_RE.sub('', url)
+    return base_url.lower()
 
 
 @dataclass
@@ -26,6 +88,15 @@ class DownloadResult:
 class ImageDownloader:
     """Dropbox画像ダウンロードクラス"""
     
+    # 並列ダウンロード数
+    MAX_WORKERS = 16
+    
+    # 進捗表示をまとめて出力する行数
+    STATUS_FLUSH_LINES = 20
+    
+    # ETagキャッシュのファイル名（base_save_path直下に保存）
+    ETAG_CACHE_FILENAME = ".etag_cache.json"
+    
     def __init__(self, base_save_path: str):
         """
         Args:
@@ -35,6 +106,42 @@ class ImageDownloader:
         self.today_folder = self._create_today_folder()
         self.downloaded_urls: Dict[str, str] = {}  # URL -> ローカルパスのマッピング
         self.row_to_image: Dict[int, str] = {}  # 行番号 -> ローカルパスのマッピング
+        self._lock = threading.Lock()  # 並列ダウンロード時のマッピング保護
+        self._status_lines: List[str] = []  # 未出力の進捗表示
+        
+        # 接続を使い回すためのセッション（Keep-Alive / リトライ付き）
+        self._session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=retry)
+        self._session.mount('https://', adapter)
+        
+        # 前回実行時のETag（正規化URL -> (ETag, ローカルパス)）
+        self._etag_cache_file = self.base_save_path / self.ETAG_CACHE_FILENAME
+        self._etag_cache: Dict[str, Tuple[str, str]] = self._load_etag_cache()
+    
+    def _load_etag_cache(self) -> Dict[str, Tuple[str, str]]:
+        """ETagキャッシュを読み込む"""
+        try:
+            if not self._etag_cache_file.exists():
+                return {}
+            data = read_json(self._etag_cache_file)
+            return {url: (etag, path) for url, (etag, path) in data.items()}
+        except Exception as e:
+            print(f"ETagキャッシュの読み込みに失敗: {e}")
+            return {}
+    
+    def _save_etag_cache(self):
+        """ETagキャッシュを保存"""
+        try:
+            with self._lock:
+                data = dict(self._etag_cache)
+            write_json(self._etag_cache_file, data)
+        except Exception as e:
+            print(f"ETagキャッシュの保存に失敗: {e}")
     
     def _create_today_folder(self) -> Path:
         """今日の日付フォルダを作成"""
@@ -43,47 +150,12 @@ class ImageDownloader:
         folder_path.mkdir(parents=True, exist_ok=True)
         return folder_path
     
-    def _convert_dropbox_url(self, url: str) -> str:
-        """
-        DropboxのURLを直接ダウンロード可能なURLに変換
-        
-        Args:
-            url: 元のDropbox URL
-            
-        Returns:
-            ダウンロード可能なURL
-        """
-        # dl=0 を dl=1 に変更してダウンロードリンクにする
-        if 'dropbox.com' in url:
-            # www.dropbox.com を dl.dropboxusercontent.com に変更
-            url = url.replace('www.dropbox.com', 'dl.dropboxusercontent.com')
-            url = url.replace('?dl=0', '?dl=1')
-            # クエリパラメータを整理
-            if '&dl=0' in url:
-                url = url.replace('&dl=0', '&dl=1')
-            elif 'dl=0' not in url and 'dl=1' not in url:
-                if '?' in url:
-                    url += '&dl=1'
-                else:
-                    url += '?dl=1'
-        return url
-    
-    def _extract_filename_from_url(self, url: str) -> str:
-        """URLからファイル名を抽出"""
-        # URLからファイル名部分を取得
-        match = re.search(r'/([^/]+\.(jpg|jpeg|png|gif|webp))', url, re.IGNORECASE)
+    def _extract_extension(self, url: str) -> str:
+        """URLのファイル名から拡張子を抽出（取得できない場合は.jpg）"""
+        match = _FILENAME_RE.search(url)
         if match:
-            return match.group(1)
-        
-        # ファイル名が取得できない場合はハッシュを使用
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-        return f"image_{url_hash}.jpg"
-    
-    def _normalize_url(self, url: str) -> str:
-        """URLを正規化（重複チェック用）"""
-        # クエリパラメータを除いた基本部分を取得
-        base_url = re.sub(r'\?.*$', '', url)
-        return base_url.lower()
+            return os.path.splitext(match.group(1))[1]
+        return ".jpg"
     
     def download_image(self, url: str, row_number: int) -> DownloadResult:
         """
@@ -106,12 +178,14 @@ class ImageDownloader:
             )
         
         # URLを正規化して重複チェック
-        normalized_url = self._normalize_url(url)
+        normalized_url = _normalize_url(url)
         
         # 既にダウンロード済みの場合はスキップ
-        if normalized_url in self.downloaded_urls:
-            existing_path = self.downloaded_urls[normalized_url]
-            self.row_to_image[row_number] = existing_path
+        with self._lock:
+            existing_path = self.downloaded_urls.get(normalized_url)
+            if existing_path is not None:
+                self.row_to_image[row_number] = existing_path
+        if existing_path is not None:
             return DownloadResult(
                 row_number=row_number,
                 original_url=url,
@@ -120,31 +194,85 @@ class ImageDownloader:
                 error_message="既存ファイルを使用（重複URL）"
             )
         
+        # 保存先はURLのハッシュから決定（連番を使わないので並列でも衝突しない）
+        ext = self._extract_extension(url)
+        url_hash = hashlib.blake2b(normalized_url.encode('utf-8'), digest_size=6).hexdigest()
+        save_path = self.today_folder / f"{url_hash}{ext}"
+        
+        # 今日のフォルダに保存済みならリクエスト自体を省略
+        if save_path.exists() and save_path.stat().st_size > 0:
+            local_path = str(save_path)
+            with self._lock:
+                self.downloaded_urls[normalized_url] = local_path
+                self.row_to_image[row_number] = local_path
+            return DownloadResult(
+                row_number=row_number,
+                original_url=url,
+                local_path=local_path,
+                success=True,
+                error_message="既存ファイルを使用（保存済み）"
+            )
+        
         try:
             # ダウンロードURLに変換
-            download_url = self._convert_dropbox_url(url)
+            download_url = _convert_dropbox_url(url)
+            
+            # 前回と同じ画像ならサーバーに304を返させる（条件付きGET）
+            headers = {}
+            with self._lock:
+                cached = self._etag_cache.get(normalized_url)
+            if cached and Path(cached[1]).exists():
+                headers['If-None-Match'] = cached[0]
+            else:
+                cached = None
             
             # ダウンロード実行
-            response = requests.get(download_url, timeout=30, stream=True)
-            response.raise_for_status()
+            response = self._session.get(download_url, headers=headers, timeout=30, stream=True)
             
-            # ファイル名を決定
-            filename = self._extract_filename_from_url(url)
-            # 連番を追加して一意にする
-            base_name, ext = os.path.splitext(filename)
-            save_filename = f"{len(self.downloaded_urls) + 1:03d}_{base_name}{ext}"
-            save_path = self.today_folder / save_filename
+            if response.status_code == 304 and cached:
+                response.close()
+                local_path = cached[1]
+                with self._lock:
+                    self.downloaded_urls[normalized_url] = local_path
+                    self.row_to_image[row_number] = local_path
+                return DownloadResult(
+                    row_number=row_number,
+                    original_url=url,
+                    local_path=local_path,
+                    success=True,
+                    error_message="既存ファイルを使用（未変更）"
+                )
             
-            # ファイル保存
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            response.raise_for_status()
+            
+            # ファイル保存（チャンクをバッファを介さず直接書き込む）
+            # 途中で失敗した場合に壊れたファイルを「保存済み」と扱わないよう、
+            # 一時ファイルに書き終えてから保存先に置き換える
+            temp_path = save_path.with_name(f"{save_path.name}.{threading.get_ident()}.part")
+            try:
+                fd = os.open(str(temp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                        _write_all(fd, chunk)
+                finally:
+                    os.close(fd)
+                os.replace(temp_path, save_path)
+            except BaseException:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
             
             local_path = str(save_path)
             
             # マッピングを更新
-            self.downloaded_urls[normalized_url] = local_path
-            self.row_to_image[row_number] = local_path
+            etag = response.headers.get('ETag')
+            with self._lock:
+                self.downloaded_urls[normalized_url] = local_path
+                self.row_to_image[row_number] = local_path
+                if etag:
+                    self._etag_cache[normalized_url] = (etag, local_path)
             
             return DownloadResult(
                 row_number=row_number,
@@ -180,21 +308,98 @@ class ImageDownloader:
         Returns:
             (ダウンロード結果リスト, 行番号→画像パスのマッピング)
         """
-        results = []
+        _, results, row_to_image = self.download_stream(accounts)
+        return results, row_to_image
+    
+    def download_stream(self, account_iter: Iterable) -> Tuple[List, List[DownloadResult], Dict[int, str]]:
+        """
+        AccountRowを受け取った順にダウンロードを開始する
+        
+        イテラブルを直接受け取れるようにした簡易API（download_all もこれを使う）。
+        SheetsClient.iter_enabled_rows を渡しても、シートの値は最初の行の前にまとめて取得される。
         
-        for account in accounts:
-            result = self.download_image(
-                url=account.icon_image_url,
-                row_number=account.row_number
+        Args:
+            account_iter: AccountRowのイテラブル
+            
+        Returns:
+            (受け取ったAccountRowのリスト, ダウンロード結果リスト, 行番号→画像パスのマッピング)
+        """
+        accounts = []
+        results: List[Optional[DownloadResult]] = []
+        
+        # 同一URLは1回だけダウンロードし、重複分は完了後に既存ファイルを割り当てる
+        duplicate_indices = []
+        seen_urls = set()
+        
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = {}
+            for idx, account in enumerate(account_iter):
+                accounts.append(account)
+                results.append(None)
+                
+                normalized_url = _normalize_url(account.icon_image_url or "")
+                if account.icon_image_url and normalized_url in seen_urls:
+                    duplicate_indices.append(idx)
+                    continue
+                seen_urls.add(normalized_url)
+                
+                future = executor.submit(
+                    self.download_image,
+                    account.icon_image_url,
+                    account.row_number
+                )
+                futures[future] = idx
+            
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+                self._print_result(results[idx])
+        
+        for idx in duplicate_indices:
+            results[idx] = self.download_image(
+                url=accounts[idx].icon_image_url,
+                row_number=accounts[idx].row_number
             )
-            results.append(result)
+            self._print_result(results[idx])
+        
+        self._flush_status()
+        self.close()
+        return accounts, results, self.row_to_image
+    
+    async def download_all_async(self, accounts: List) -> Tuple[List[DownloadResult], Dict[int, str]]:
+        """
+        download_all をイベントループを塞がずに実行
+        
+        Args:
+            accounts: AccountRowのリスト
             
-            if result.success:
-                print(f"✓ 行{account.row_number}: {result.local_path}")
-            else:
-                print(f"✗ 行{account.row_number}: {result.error_message}")
+        Returns:
+            (ダウンロード結果リスト, 行番号→画像パスのマッピング)
+        """
+        return await asyncio.to_thread(self.download_all, accounts)
+    
+    def _print_result(self, result: DownloadResult):
+        """ダウンロード結果を表示（STATUS_FLUSH_LINES行ごとにまとめて出力）"""
+        if result.success:
+            self._status_lines.append(f"✓ 行{result.row_number}: {result.local_path}")
+        else:
+            self._status_lines.append(f"✗ 行{result.row_number}: {result.error_message}")
         
-        return results, self.row_to_image
+        if len(self._status_lines) >= self.STATUS_FLUSH_LINES:
+            self._flush_status()
+    
+    def _flush_status(self):
+        """溜まった進捗表示を出力"""
+        if not self._status_lines:
+            return
+        sys.stdout.write("\n".join(self._status_lines) + "\n")
+        sys.stdout.flush()
+        self._status_lines = []
+    
+    def close(self):
+        """HTTPセッションを閉じ、ETagキャッシュを保存する"""
+        self._save_etag_cache()
+        self._session.close()
     
     def get_image_path_for_row(self, row_number: int) -> Optional[str]:
         """
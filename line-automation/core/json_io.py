@@ -0,0 +1,53 @@
+"""
+JSON入出力モジュール
+orjsonがインストールされていれば使用し、なければ標準のjsonで同じ形式を読み書き
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson  # 任意依存（インストールされていれば高速なJSON処理を使う）
+except ImportError:
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """
+    インデント付きのJSON（UTF-8のバイト列）に変換
+
+    Args:
+        data: 変換するデータ
+
+    Returns:
+        JSONのバイト列
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def loads(content: bytes) -> Any:
+    """
+    JSONのバイト列を読み込む
+
+    Args:
+        content: JSONのバイト列
+
+    Returns:
+        読み込んだデータ
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def read_json(path: Path) -> Any:
+    """JSONファイルを読み込む"""
+    return loads(path.read_bytes())
+
+
+def write_json(path: Path, data: Any):
+    """JSONファイルに書き込む"""
+    path.write_bytes(dumps(data))
@@ -4,10 +4,16 @@ LINE公式アカウント自動化モジュール
 """
 
 import asyncio
+import os
 import re
-from typing import Optional, Dict, Callable
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional, Dict, Callable, List, Tuple, AsyncIterator
 from dataclasses import dataclass
 
+from playwright.async_api import Locator, Page, Request, Response, TimeoutError as PlaywrightTimeoutError
+
 from config.settings import (
     LINE_LOGIN_URL,
     LINE_MANAGER_URL,
@@ -15,12 +21,146 @@ from config.settings import (
     LINE_ENTRY_URL,
     CATEGORY_GROUP,
     CATEGORY,
+    CAPTCHA_WAIT_TIMEOUT,
+    TAB_CLEANUP_INTERVAL,
 )
-from .stealth_browser import StealthBrowser
+from .stealth_browser import StealthBrowser, StealthBrowserPool
 from .sheets_client import AccountRow
 from .session_manager import SessionManager
 
 
+# スプレッドシートに書き戻す結果（AutomationResultの属性名, 列設定のキー）
+_WRITEBACK_MAP: Tuple[Tuple[str, str], ...] = (
+    ('basic_id', 'col_basic_id'),                # ベーシックID
+    ('permission_link', 'col_permission_link'),  # 権限追加リンク
+    ('friend_link', 'col_friend_link'),          # 友達追加リンク
+    ('access_token', 'col_access_token'),        # アクセストークン
+)
+
+# CAPTCHA検出に使用するセレクタ
+CAPTCHA_SELECTORS: List[str] = [
+    'iframe[src*="recaptcha"]',
+    'iframe[title*="reCAPTCHA"]',
+    '.g-recaptcha',
+    '#recaptcha',
+    'div[data-sitekey]',
+]
+
+# URLからベーシックID（@xxxx）を抽出する正規表現
+_BASIC_ID_RE = re.compile(r'@[a-zA-Z0-9]+')
+
+# get_by_roleで照合するボタン名（アクセシビリティツリーで1回の探索で済む）
+_ISSUE_BUTTON_NAME_RE = re.compile(r'^(発行|Issue)$')
+_MESSAGING_API_TAB_NAME_RE = re.compile(r'^Messaging API(設定)?$')
+
+# reCAPTCHAの応答トークンが入ったかを返すスクリプト（要素がなければ未完了として扱う）
+_CAPTCHA_SOLVED_JS = """
+() => {
+    const response = document.querySelector('#g-recaptcha-response');
+    return response ? response.value !== '' : false;
+}
+"""
+
+# 表示中の読み取り専用の入力欄に値が入るのを待って返すスクリプト（待機と読み取りをブラウザ側で1回の呼び出しで行う）
+# 表示中のモーダル内の入力欄を優先し、非表示の入力欄は対象にしない。タイムアウト時はエラーにする
+_WAIT_READONLY_VALUE_JS = """
+(timeout) => new Promise((resolve, reject) => {
+    const started = Date.now();
+    const timer = setInterval(() => {
+        const inputs = [
+            ...document.querySelectorAll('.modal.show input[readonly]'),
+            ...document.querySelectorAll('input[readonly]'),
+        ];
+        const input = inputs.find((e) => e.offsetParent !== null && e.value);
+        if (input) {
+            clearInterval(timer);
+            resolve(input.value);
+        } else if (Date.now() - started > timeout) {
+            clearInterval(timer);
+            reject(new Error('発行されたリンクが表示されませんでした'));
+        }
+    }, 100);
+})
+"""
+
+# ページ内からアクセストークンを探すスクリプト（見つからなければnull）
+_TOKEN_SCAN_JS = """
+() => {
+    // トークンの特徴: 100文字を超える、英数字と記号のみ、スペースなし（すべて1つの正規表現で判定）
+    const pattern = /^[a-zA-Z0-9+/=]{101,}$/;
+    // 候補の文字列を整えてトークンの条件を満たせば返す（判定はこの関数に集約）
+    const clean = (text) => {
+        text = (text || '').trim();
+        // Reissueなどのボタンテキストが混入している場合を除去
+        if (text.endsWith('Reissue')) {
+            text = text.slice(0, -7).trim();
+        } else if (text.endsWith('再発行')) {
+            text = text.slice(0, -3).trim();
+        }
+        return pattern.test(text) ? text : null;
+    };
+    // トークンが入りやすい要素から順に探し、見つからない場合のみ全体を走査する
+    const scopes = ['code', 'textarea', 'div.copyable', '[data-copy]', 'span.token', 'div, span, p'];
+    for (const scope of scopes) {
+        for (const element of document.querySelectorAll(scope)) {
+            const token = clean(element.value ?? element.textContent);
+            if (token) return token;
+        }
+    }
+    // div.copyableのcontent属性
+    const copyable = document.querySelector('div.copyable');
+    return copyable ? clean(copyable.getAttribute('content')) : null;
+}
+"""
+
+# 表示中のモーダルを「閉じる」ボタンで閉じるスクリプト
+# 戻り値: 'no_modal'（モーダルなし）/ 'closed'（ボタンで閉じた）/ 'escape'（ボタンがなくESCキーが必要）
+_CLOSE_MODAL_JS = """
+() => {
+    if (!document.querySelector('.modal-content, .modal.show')) return 'no_modal';
+    const isClose = (button) => (button.textContent || '').includes('閉じる');
+    // 1. btn-secondaryの「閉じる」ボタンを優先、2. 汎用の「閉じる」ボタン
+    const button = Array.from(document.querySelectorAll('button.btn-secondary')).find(isClose)
+        || Array.from(document.querySelectorAll('button')).find(isClose);
+    if (!button) return 'escape';
+    button.click();
+    return 'closed';
+}
+"""
+
+# Cropper.jsのAPIでクロップ範囲をコンテナ全体に広げるスクリプト（インスタンスがなければfalse）
+_CROP_MAXIMIZE_JS = """
+() => {
+    const container = document.querySelector('.cropper-container');
+    if (!container) return false;
+    // Cropper.jsは元の画像要素（コンテナの直前、cropper-hiddenクラス付き）にインスタンスを保持する
+    const candidates = [container.previousElementSibling, ...document.querySelectorAll('.cropper-hidden')];
+    const cropper = candidates.map((e) => e && e.cropper).find((c) => c && c.setCropBoxData);
+    if (!cropper) return false;
+    const data = cropper.getContainerData();
+    cropper.setCropBoxData({left: 0, top: 0, width: data.width, height: data.height});
+    return true;
+}
+"""
+
+# 表示中のCAPTCHA要素を探すスクリプト（見つかったセレクタを返す）
+# 要素ごとにドライバーと往復しないよう、判定はすべてブラウザ側で1回の呼び出しで行う
+_CAPTCHA_DETECT_JS = """
+(selectors) => {
+    for (const selector of selectors) {
+        const element = document.querySelector(selector);
+        if (!element) continue;
+        const style = getComputedStyle(element);
+        if (style.visibility === 'hidden' || style.display === 'none') continue;
+        // サイズが小さいもの（0x0等）は非表示扱い
+        const rect = element.getBoundingClientRect();
+        if (rect.width > 10 && rect.height > 10) return selector;
+    }
+    return null;
+}
+"""
+
+
 @dataclass
 class AutomationResult:
     """自動化処理の結果"""
@@ -33,6 +173,28 @@ class AutomationResult:
     error_message: str = ""
 
 
+@dataclass(frozen=True)
+class AccountUrls:
+    """作成したアカウントの各設定ページのURL（アカウントごとに1回だけ組み立てる）"""
+    basic_id: str
+    messaging_api: str   # Messaging API設定
+    user: str            # 権限設定
+    friend_url: str      # 友達追加URL設定
+    page_edit: str       # プロフィール（アイコン）編集
+    
+    @classmethod
+    def for_account(cls, basic_id: str) -> 'AccountUrls':
+        """ベーシックIDから各URLを作成"""
+        account_url = f"{LINE_MANAGER_URL}account/{basic_id}"
+        return cls(
+            basic_id=basic_id,
+            messaging_api=f"{account_url}/setting/messaging-api",
+            user=f"{account_url}/setting/user",
+            friend_url=f"{account_url}/gainfriends/add-friend-url",
+            page_edit=f"https://page.line.biz/account/{basic_id}",
+        )
+
+
 class LineAutomation:
     """LINE公式アカウント自動化クラス"""
     
@@ -43,7 +205,9 @@ class LineAutomation:
         headless: bool = False,
         biz_manager_name: str = "",
         on_status_update: Optional[Callable[[str], None]] = None,
-        on_captcha_required: Optional[Callable[[], asyncio.Future]] = None
+        on_captcha_required: Optional[Callable[[], asyncio.Future]] = None,
+        browser: Optional[StealthBrowser] = None,
+        debug_token: bool = False
     ):
         """
         Args:
@@ -53,25 +217,107 @@ class LineAutomation:
             biz_manager_name: ビジネスマネージャーの組織名（設定されている場合）
             on_status_update: ステータス更新コールバック
             on_captcha_required: CAPTCHA検知時のコールバック（Futureを返す）
+            browser: 起動済みのブラウザ（StealthBrowser.spawn()で作成したもの等）。省略時は自前で起動する
+            debug_token: アクセストークン取得失敗時にページのHTMLを保存するか（環境変数LINE_DEBUG_TOKENでも有効）
         """
         self.email = email
         self.password = password
         self.biz_manager_name = biz_manager_name
-        self.browser = StealthBrowser(headless=headless)
+        self.browser = browser or StealthBrowser(headless=headless)
         self.on_status_update = on_status_update or (lambda x: print(x))
         self.on_captcha_required = on_captcha_required
         self.session_manager = SessionManager()
         self.is_logged_in = False
         self.current_basic_id = ""
+        self._provider_url = ""  # Developers Consoleの組織（プロバイダー）ページURL（2件目以降は直接移動）
+        self._recaptcha_seen = False  # reCAPTCHAのスクリプト/iframeへのリクエストがあったか
+        self._session_preloaded = False  # 保存されたセッションをコンテキスト作成時に読み込んだか
+        self._needs_manager_navigation = True  # アカウント作成前に管理画面トップへ移動する必要があるか
+        self.debug_token = debug_token or bool(os.environ.get('LINE_DEBUG_TOKEN'))
+        self._accounts_since_cleanup = 0  # 前回タブを片付けてから処理したアカウント数
     
     def log(self, message: str):
         """ステータスログ"""
         self.on_status_update(message)
     
+    @property
+    def modal(self) -> Locator:
+        """表示中のモーダル（モーダル内の要素検索の起点）"""
+        return self.browser.page.locator('.modal.show')
+    
+    async def _wait_for_any(
+        self,
+        selectors: List[str],
+        timeout: int = 10000,
+        page: Optional[Page] = None
+    ) -> Optional[str]:
+        """
+        複数のセレクタのうち最初に表示されたものを待つ（固定時間のsleepの代わり）
+        
+        Args:
+            selectors: 待機するセレクタのリスト
+            timeout: タイムアウト（ミリ秒）
+            page: 待機するページ（省略時は現在のページ）
+            
+        Returns:
+            最初に表示されたセレクタ（どれも表示されなければNone）
+        """
+        page = page or self.browser.page
+        tasks = {
+            asyncio.create_task(page.wait_for_selector(selector, state='visible', timeout=timeout)): selector
+            for selector in selectors
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return tasks[task]
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # 未回収の例外警告を防ぐ
+    
+    async def _click_if_present(self, page: Page, selector: str, timeout: int = 1500) -> bool:
+        """
+        要素が表示されればクリック（存在確認とクリックを1回の呼び出しで行う）
+        
+        Args:
+            page: 操作するページ
+            selector: クリックする要素のセレクタ
+            timeout: 表示を待つ時間（ミリ秒）。表示されない要素は短い待ち時間で見切る
+            
+        Returns:
+            クリックしたかどうか
+        """
+        try:
+            await page.locator(selector).first.click(timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+    
     async def start(self) -> bool:
-        """ブラウザを起動"""
-        self.log("ブラウザを起動中...")
-        return await self.browser.launch()
+        """ブラウザを起動（起動済みのブラウザを渡された場合は起動を省略）"""
+        if self.browser.context is None:
+            self.log("ブラウザを起動中...")
+            # 保存されたセッションがあればコンテキスト作成時にCookie・localStorageをまとめて読み込む
+            storage_state = await self.session_manager.load_storage_state_async()
+            if not await self.browser.launch(storage_state):
+                return False
+            self._session_preloaded = storage_state is not None
+        
+        # reCAPTCHAの読み込みを監視（新しいタブも含めてコンテキスト全体で）
+        self.browser.context.on("request", self._on_request)
+        return True
+    
+    def _on_request(self, request: Request):
+        """リクエスト監視（reCAPTCHAの読み込みを記録）"""
+        if 'recaptcha/' in request.url:
+            self._recaptcha_seen = True
     
     async def stop(self):
         """ブラウザを終了"""
@@ -86,12 +332,12 @@ class LineAutomation:
         Returns:
             ログイン成功かどうか
         """
-        # 保存されたセッションを試行
-        if await self._try_restore_session():
+        # 保存されたセッションを試行、セッションがない/無効な場合は通常ログイン
+        if await self._try_restore_session() or await self._login_with_credentials():
+            # ログイン直後は管理画面にいるため、最初のアカウント作成では移動を省略できる
+            self._needs_manager_navigation = False
             return True
-        
-        # セッションがない/無効な場合は通常ログイン
-        return await self._login_with_credentials()
+        return False
     
     async def _try_restore_session(self) -> bool:
         """
@@ -107,21 +353,22 @@ class LineAutomation:
         self.log("保存されたセッションを復元中...")
         
         try:
-            session_data = self.session_manager.load_session()
-            if not session_data:
-                return False
-            
-            # Cookieを設定してから管理画面にアクセス
-            cookies = session_data.get("cookies", [])
-            if cookies:
-                await self.browser.context.add_cookies(cookies)
+            # 起動時に読み込んでいなければCookieを設定してから管理画面にアクセス
+            if not self._session_preloaded:
+                session_data = await self.session_manager.load_session_async()
+                if not session_data:
+                    return False
+                
+                cookies = session_data.get("cookies", [])
+                if cookies:
+                    await self.browser.context.add_cookies(cookies)
             
             # 管理画面に直接アクセス
             self.log("管理画面にアクセス中...")
-            await self.browser.navigate(LINE_MANAGER_URL)
-            await asyncio.sleep(3)
+            # ログイン画面へのリダイレクトを判定するため、通信が落ち着くまで待つ
+            await self.browser.navigate(LINE_MANAGER_URL, wait_until='networkidle')
             
-            current_url = await self.browser.get_current_url()
+            current_url = self.browser.url
             
             # ログイン画面にリダイレクトされていないか確認
             if 'manager.line.biz' in current_url and 'login' not in current_url:
@@ -140,8 +387,9 @@ class LineAutomation:
     async def _save_session(self):
         """現在のセッションを保存"""
         try:
-            cookies = await self.browser.context.cookies()
-            self.session_manager.save_session(cookies)
+            # Cookieに加えてlocalStorageも保存し、他のコンテキストでも再利用できるようにする
+            storage_state = await self.browser.context.storage_state()
+            await self.session_manager.save_session_async(storage_state.get("cookies", []), storage_state)
             self.log("✓ セッションを保存しました（次回から自動ログイン）")
         except Exception as e:
             self.log(f"セッション保存エラー: {e}")
@@ -153,27 +401,16 @@ class LineAutomation:
         Returns:
             CAPTCHAが表示されているかどうか
         """
+        # reCAPTCHAが読み込まれていなければDOMを調べるまでもない
+        if not self._recaptcha_seen:
+            return False
+        
         try:
             # reCAPTCHAのiframeを検出（表示されているもののみ）
-            captcha_selectors = [
-                'iframe[src*="recaptcha"]',
-                'iframe[title*="reCAPTCHA"]',
-                '.g-recaptcha',
-                '#recaptcha',
-                'div[data-sitekey]',
-            ]
-            
-            for selector in captcha_selectors:
-                element = await self.browser.page.query_selector(selector)
-                if element:
-                    # 要素が実際に表示されているかチェック
-                    is_visible = await element.is_visible()
-                    if is_visible:
-                        # さらにサイズをチェック（0x0は非表示扱い）
-                        box = await element.bounding_box()
-                        if box and box['width'] > 10 and box['height'] > 10:
-                            self.log(f"🔍 CAPTCHA検出（表示中）: {selector}")
-                            return True
+            selector = await self.browser.page.evaluate(_CAPTCHA_DETECT_JS, CAPTCHA_SELECTORS)
+            if selector:
+                self.log(f"🔍 CAPTCHA検出（表示中）: {selector}")
+                return True
             
             return False
         except Exception as e:
@@ -188,16 +425,38 @@ class LineAutomation:
         self.log("手動で認証を完了してください...")
         
         if self.on_captcha_required:
-            # コールバックでUIに通知し、完了を待つ
-            try:
-                await self.on_captcha_required()
-                self.log("✓ 認証完了確認")
-            except Exception as e:
-                self.log(f"CAPTCHA待機エラー: {e}")
+            # コールバックでUIに通知し、完了を待つ（完了を押されても認証が終わっていなければ再度通知する）
+            deadline = time.monotonic() + CAPTCHA_WAIT_TIMEOUT
+            while time.monotonic() < deadline:
+                try:
+                    await self.on_captcha_required()
+                except Exception as e:
+                    self.log(f"CAPTCHA待機エラー: {e}")
+                    return
+                if await self._is_captcha_solved():
+                    self.log("✓ 認証完了確認")
+                    return
+                self.log("⚠️ 認証が完了していません。ブラウザで認証を完了してください")
+                await asyncio.sleep(0.5)
         else:
-            # コールバックがない場合は一定時間待機
-            self.log("60秒以内に認証を完了してください...")
-            await asyncio.sleep(60)
+            # コールバックがない場合は認証が終わるまで（最大で一定時間）待機
+            self.log(f"{CAPTCHA_WAIT_TIMEOUT}秒以内に認証を完了してください...")
+            deadline = time.monotonic() + CAPTCHA_WAIT_TIMEOUT
+            while time.monotonic() < deadline:
+                if await self._is_captcha_solved():
+                    self.log("✓ 認証完了確認")
+                    return
+                await asyncio.sleep(0.5)
+    
+    async def _is_captcha_solved(self) -> bool:
+        """CAPTCHAの認証が終わったか（応答トークンが入った、またはCAPTCHAの表示が消えた）"""
+        try:
+            page = self.browser.page
+            return await page.evaluate(_CAPTCHA_SOLVED_JS) or not await page.evaluate(
+                _CAPTCHA_DETECT_JS, CAPTCHA_SELECTORS
+            )
+        except Exception:
+            return False  # ページ遷移中は判定できないため次の確認を待つ
     
     async def _login_with_credentials(self) -> bool:
         """
@@ -207,27 +466,22 @@ class LineAutomation:
             ログイン成功かどうか
         """
         self.log("ログインページに移動中...")
+        self._recaptcha_seen = False
         await self.browser.navigate(LINE_LOGIN_URL)
         
         try:
-            # ページ読み込み待機
-            await asyncio.sleep(2)
-            
-            # ビジネスアカウントボタンをクリック
+            # ビジネスアカウントボタンをクリック（表示されるまで待機してからクリック）
             self.log("ビジネスアカウントボタンをクリック...")
             await self.browser.human_click('toly-button[data-email-login-button="true"]')
-            await asyncio.sleep(2)
             await self.browser.wait_for_load()
             
             # メールアドレス入力
             self.log("メールアドレスを入力中...")
             await self.browser.human_type('input[type="email"]', self.email)
-            await asyncio.sleep(1)
             
             # パスワード入力
             self.log("パスワードを入力中...")
             await self.browser.human_type('input[type="password"]', self.password)
-            await asyncio.sleep(1)
             
             # ログイン実行（Enterキーで送信）
             self.log("ログイン実行中...")
@@ -235,12 +489,12 @@ class LineAutomation:
             
             # ログイン処理の完了を待機
             self.log("ログイン処理を待機中...")
-            await asyncio.sleep(3)
+            await self.browser.wait_for_load()
             
             # CAPTCHA検知
             if await self._detect_captcha():
                 await self._wait_for_captcha_completion()
-                await asyncio.sleep(2)
+                await self.browser.wait_for_load()
             
             # ページ遷移を待つ
             try:
@@ -254,15 +508,15 @@ class LineAutomation:
                 return True
             except Exception:
                 # URLが変わらない場合、現在のURLを確認
-                current_url = await self.browser.get_current_url()
+                current_url = self.browser.url
                 self.log(f"現在のURL: {current_url}")
                 
                 # 再度CAPTCHA確認
                 if await self._detect_captcha():
                     self.log("CAPTCHAがまだ表示されています。再度認証してください。")
                     await self._wait_for_captcha_completion()
-                    await asyncio.sleep(2)
-                    current_url = await self.browser.get_current_url()
+                    await self.browser.wait_for_load()
+                    current_url = self.browser.url
                 
                 if 'manager.line.biz' in current_url:
                     self.is_logged_in = True
@@ -292,28 +546,28 @@ class LineAutomation:
             処理結果
         """
         result = AutomationResult(row_number=account.row_number, success=False)
+        self._recaptcha_seen = False  # 前の行で読み込まれたreCAPTCHAを引きずらない
         
         try:
             # ===== アカウント作成処理 =====
             self.log(f"[行{account.row_number}] アカウント作成開始: {account.line_name}")
             
-            # 管理画面トップに戻る（2件目以降のために確実に遷移）
-            self.log("管理画面トップへ移動...")
-            await self.browser.navigate(LINE_MANAGER_URL)
-            await asyncio.sleep(2)
+            # 管理画面トップに戻る（2件目以降のために確実に遷移、ログイン直後は省略）
+            current_url = self.browser.url
+            if self._needs_manager_navigation or 'manager.line.biz' not in current_url:
+                self.log("管理画面トップへ移動...")
+                await self.browser.navigate(LINE_MANAGER_URL)
+            self._needs_manager_navigation = True  # 以降の処理で別のページに移動するため
             
-            # 作成ボタンをクリック（別タブが開く）
+            # 作成ボタンをクリックし、開いた新しいタブに切り替え
             self.log("作成ボタンをクリック...")
-            await self.browser.human_click(f'a[href="{LINE_ENTRY_URL}"]')
-            
-            # 新しいタブに切り替え
+            await self.browser.human_click_new_tab(f'a[href="{LINE_ENTRY_URL}"]')
             self.log("新しいタブに移動...")
-            await self.browser.switch_to_new_tab()
             await self.browser.wait_for_load()
             
             # アカウント名を入力
             self.log("アカウント名を入力...")
-            await self.browser.human_type('input[name="bot.name"]', account.line_name)
+            await self.browser.fill('input[name="bot.name"]', account.line_name)
             
             # 大業種を選択（設定値から取得）
             self.log("大業種を選択...")
@@ -339,33 +593,34 @@ class LineAutomation:
             
             # 確認ボタンをクリック
             self.log("確認ボタンをクリック...")
-            try:
-                await self.browser.page.click('button:has-text("確認")', timeout=10000)
-            except Exception:
-                # フォールバック: type=submitで探す
-                await self.browser.page.click('button[type="submit"]', timeout=5000)
-            await asyncio.sleep(3)
+            page = self.browser.page
+            # 「確認」ボタン、なければtype=submitのボタン
+            await page.get_by_role('button', name='確認').or_(
+                page.locator('button[type="submit"]')
+            ).first.click(timeout=10000)
+            
+            # 確認画面の完了ボタンが表示されるまで待機
+            await self._wait_for_any(['button[data-entrytype="unverified"]', 'button:has-text("完了")'])
             
             # 完了ボタンをクリック
             self.log("完了ボタンをクリック...")
+            # data-entrytypeのボタン、なければ「完了」ボタン
+            complete_button = page.locator('button[data-entrytype="unverified"]').or_(
+                page.get_by_role('button', name='完了')
+            ).first
             try:
-                # data-entrytypeで探す
-                await self.browser.page.click('button[data-entrytype="unverified"]', timeout=10000)
+                await complete_button.click(timeout=10000)
             except Exception:
-                try:
-                    await self.browser.page.click('button:has-text("完了")', timeout=5000)
-                except Exception:
-                    # 最終フォールバック
-                    await self.browser.page.click('button.btn-primary:has-text("完了")', force=True, timeout=5000)
+                # 最終フォールバック（他の要素に覆われている場合）
+                await complete_button.click(force=True, timeout=5000)
             
-            # ページ遷移を待つ
+            # ページ遷移を待つ（認証スキップリンクかCAPTCHAのどちらかが表示されるまで）
             self.log("ページ遷移を待機中...")
-            await asyncio.sleep(3)
+            await self._wait_for_any(['a:has-text("あとで認証を行う")'] + CAPTCHA_SELECTORS)
             
             # CAPTCHA検知（完了ボタン後）
             if await self._detect_captcha():
                 await self._wait_for_captcha_completion()
-                await asyncio.sleep(2)
             
             # 「あとで認証を行う」をクリック
             self.log("認証スキップ...")
@@ -381,52 +636,54 @@ class LineAutomation:
             except Exception as e:
                 self.log(f"認証スキップリンクが見つかりません: {e}")
                 # 既に管理画面にいる可能性をチェック
-                current_url = await self.browser.get_current_url()
+                current_url = self.browser.url
                 if 'manager.line.biz/account' in current_url:
                     self.log("既に管理画面に遷移済み")
                 else:
                     raise
             
-            await asyncio.sleep(2)
+            await self.browser.wait_for_load()
             
-            # 同意ボタンをクリック（2回）
+            # 同意ボタンをクリック（2回、2回目は出ていなければすぐに次へ）
             self.log("利用規約に同意...")
-            if await self.browser.check_element_exists('#modalAgreementAgree'):
-                await self.browser.human_click('#modalAgreementAgree')
-                await self.browser.wait_for_load()
-            
-            if await self.browser.check_element_exists('#modalAgreementAgree'):
-                await self.browser.human_click('#modalAgreementAgree')
+            for timeout in (5000, 1500):
+                if not await self._click_if_present(self.browser.page, '#modalAgreementAgree', timeout):
+                    break
                 await self.browser.wait_for_load()
             
             # ポップアップを「閉じる」ボタンで閉じてからリロード
-            self.log("ポップアップを閉じてリロード中...")
+            self.log("ポップアップを閉じています...")
             await self._close_modal_popups()
             
-            await self.browser.page.reload()
-            await self.browser.wait_for_load()
-            await asyncio.sleep(2)
+            # 閉じきれなかったモーダルが残っている場合のみリロード
+            if await self.modal.count():
+                self.log("ポップアップが残っているためリロード中...")
+                await self.browser.page.reload()
+                await self.browser.wait_for_load()
             
             # ベーシックIDを取得
-            current_url = await self.browser.get_current_url()
+            current_url = self.browser.url
             basic_id = self._extract_basic_id(current_url)
             result.basic_id = basic_id
             self.current_basic_id = basic_id
             self.log(f"✓ アカウント作成完了: {basic_id}")
+            urls = AccountUrls.for_account(basic_id)
             
-            # ===== アイコン変更処理 =====
-            if image_path:
-                await self._change_icon(basic_id, image_path)
-            
-            # ===== メッセージAPI有効化処理 =====
-            await self._enable_messaging_api(basic_id)
-            
-            # ===== 権限追加処理 =====
-            permission_link = await self._add_permission(basic_id)
+            # ===== アイコン変更・メッセージAPI有効化・権限追加・友達追加リンク取得 =====
+            # 互いに独立しているため、同じコンテキストの別タブで並行して処理する
+            api_view = await self.browser.open_view()
+            link_view = await self.browser.open_view()
+            try:
+                steps = [
+                    self._enable_messaging_api(urls, api_view),
+                    self._get_links(urls, link_view),
+                ]
+                if image_path:
+                    steps.append(self._change_icon(urls, image_path))
+                _, (permission_link, friend_link), *_ = await asyncio.gather(*steps)
+            finally:
+                await asyncio.gather(api_view.close(), link_view.close())
             result.permission_link = permission_link
-            
-            # ===== 友達追加リンク取得 =====
-            friend_link = await self._get_friend_link(basic_id)
             result.friend_link = friend_link
             
             # ===== アクセストークン取得 =====
@@ -449,36 +706,28 @@ class LineAutomation:
         # ラジオボタンを選択（ラベルをクリック）
         await self.browser.human_click('label:has-text("ビジネスマネージャーの組織を選択")')
         await self.browser.random_wait()
-        await asyncio.sleep(1)
         
         # 「組織を選択」ボタンをクリック
         await self.browser.human_click('button:has-text("組織を選択")')
         await self.browser.random_wait()
-        await asyncio.sleep(1)
         
         # 組織名を入力
-        await self.browser.human_type('input[placeholder="組織名を入力"]', self.biz_manager_name)
-        await self.browser.random_wait()
-        await asyncio.sleep(2)  # 検索結果が表示されるまで待機
+        await self.browser.fill('input[placeholder="組織名を入力"]', self.biz_manager_name)
+        # 検索結果が表示されるまで待機（該当なしの場合は短いタイムアウトで抜ける）
+        await self._wait_for_any(['.modal.show button:has-text("選択")'], timeout=3000)
         
         # 検索結果から選択を試みる
         select_button_found = False
         try:
-            # モーダル内の「選択」ボタンを探す
-            modal_selector = '.modal.show button.btn-outline-primary:has-text("選択")'
-            select_button = await self.browser.page.query_selector(modal_selector)
+            # モーダル内の「選択」ボタンを探す（btn-outline-primaryを優先）
+            select_button = self.modal.locator('button.btn-outline-primary', has_text='選択').or_(
+                self.modal.get_by_role('button', name='選択')
+            ).first
             
-            if select_button:
-                await self.browser.page.click(modal_selector, force=True, timeout=5000)
+            if await select_button.count():
+                await select_button.click(force=True, timeout=5000)
                 select_button_found = True
                 self.log(f"✓ 既存の組織を選択: {self.biz_manager_name}")
-            else:
-                # フォールバック: 直接「選択」テキストを探す
-                select_button = await self.browser.page.query_selector('.modal.show button:has-text("選択")')
-                if select_button:
-                    await select_button.click(force=True)
-                    select_button_found = True
-                    self.log(f"✓ 既存の組織を選択: {self.biz_manager_name}")
         except Exception as e:
             self.log(f"組織選択ボタンが見つかりません: {e}")
         
@@ -488,69 +737,76 @@ class LineAutomation:
             
             # モーダルを閉じる（ESCキーまたは閉じるボタン）
             try:
-                close_btn = await self.browser.page.query_selector('.modal.show button.close, .modal.show button:has-text("閉じる")')
-                if close_btn:
+                close_btn = self.modal.locator('button.close').or_(
+                    self.modal.get_by_role('button', name='閉じる')
+                ).first
+                if await close_btn.count():
                     await close_btn.click(force=True)
                 else:
                     await self.browser.page.keyboard.press('Escape')
             except Exception:
                 await self.browser.page.keyboard.press('Escape')
-            await asyncio.sleep(1)
+            try:
+                await self.browser.page.wait_for_selector('.modal.show', state='hidden', timeout=5000)
+            except Exception:
+                pass
             
             # 「ビジネスマネージャーの組織を作成」ラジオボタンを選択
             await self.browser.human_click('label:has-text("ビジネスマネージャーの組織を作成")')
             await self.browser.random_wait()
-            await asyncio.sleep(1)
             
             # 組織名入力欄に入力（「組織を作成」選択後に表示される入力欄）
             # セレクタ: div.d-flex.mt-2 内の input.form-control
             create_input_selector = 'div.d-flex.mt-2 input.form-control'
             try:
-                await self.browser.human_type(create_input_selector, self.biz_manager_name)
+                # 見つからない場合に既定の30秒待たないよう短めに見切ってフォールバックへ
+                await self.browser.fill(create_input_selector, self.biz_manager_name, timeout=5000)
                 self.log(f"✓ 新規組織名を入力: {self.biz_manager_name}")
             except Exception as e:
                 # フォールバック: input[value="new"] の兄弟要素から探す
                 self.log(f"入力欄セレクタ失敗、フォールバック試行: {e}")
                 fallback_selector = 'input.form-control[aria-required="false"]'
-                await self.browser.human_type(fallback_selector, self.biz_manager_name)
+                await self.browser.fill(fallback_selector, self.biz_manager_name)
         
         await self.browser.random_wait()
     
-    async def _change_icon(self, basic_id: str, image_path: str):
+    async def _change_icon(self, urls: AccountUrls, image_path: str):
         """アイコンを変更"""
         self.log("アイコン変更処理を開始...")
         
+        # クロップ画面は画像の読み込みが必要なため、この間だけ画像のブロックを解除
+        self.browser.load_images = True
         try:
-            # 編集ボタンをクリック（別タブが開く）
-            await self.browser.human_click(f'a[href="https://page.line.biz/account/{basic_id}"]')
-            await self.browser.switch_to_new_tab()
+            # 編集ボタンをクリックし、開いた別タブに切り替え
+            await self.browser.human_click_new_tab(f'a[href="{urls.page_edit}"]')
             await self.browser.wait_for_load()
-            await asyncio.sleep(2)
             
             # カメラアイコンをクリック
             await self.browser.human_click('i.la-camera')
             await self.browser.random_wait()
             
-            # ファイルアップロード（filechooserイベントを使用してダイアログを回避）
+            # ファイルアップロード（カメラアイコンで開いたモーダル内のファイル入力に直接設定してダイアログを回避）
+            # ページ内にはカバー画像など他のアップロード欄もあるため、モーダル外の入力欄は使わない
             self.log("画像をアップロード中...")
             
-            # filechooserイベントをリッスンしながら「アップロード」をクリック
-            async with self.browser.page.expect_file_chooser() as fc_info:
-                await self.browser.human_click('a:has-text("アップロード")')
-            
-            file_chooser = await fc_info.value
-            await file_chooser.set_files(image_path)
+            try:
+                await self.browser.page.locator('.modal.show input[type="file"]').first.set_input_files(image_path, timeout=3000)
+            except Exception:
+                # 入力欄がまだない場合はfilechooserイベントをリッスンしながら「アップロード」をクリック
+                async with self.browser.page.expect_file_chooser() as fc_info:
+                    await self.browser.human_click('a:has-text("アップロード")')
+                
+                file_chooser = await fc_info.value
+                await file_chooser.set_files(image_path)
             
             self.log("画像アップロード完了、クロップ画面を待機...")
-            await asyncio.sleep(3)
             
-            # クロップ範囲を調整
+            # クロップ範囲を調整（クロッパーの表示を待ってから操作）
             await self._adjust_crop()
             
             # OKボタンをクリック
             await self.browser.human_click('button[data-automation="confirmation-modal-confirm"]:has-text("OK")')
             await self.browser.random_wait()
-            await asyncio.sleep(2)
             
             # 公開ボタンをクリック（data-automation属性を使用）
             await self.browser.page.click('button[data-automation="confirmation-modal-confirm"]:has-text("公開")', force=True, timeout=10000)
@@ -563,14 +819,21 @@ class LineAutomation:
             
         except Exception as e:
             self.log(f"⚠ アイコン変更エラー: {e}")
+        finally:
+            self.browser.load_images = False
     
     async def _adjust_crop(self):
         """クロップ範囲を調整（最大範囲に）"""
         self.log("クロップ範囲を調整中...")
         
         try:
-            # クロッパーの面を左上にドラッグ
             face_element = await self.browser.page.wait_for_selector('.cropper-face', timeout=5000)
+            
+            # Cropper.jsのAPIで直接範囲を設定（できなければドラッグで調整）
+            if await self.browser.page.evaluate(_CROP_MAXIMIZE_JS):
+                return
+            
+            # クロッパーの面を左上にドラッグ
             if face_element:
                 box = await face_element.bounding_box()
                 if box:
@@ -578,13 +841,13 @@ class LineAutomation:
                     await self.browser.drag_element('.cropper-face', int(box['x']), int(box['y']))
             
             # 右下のハンドルを右下にドラッグ
-            se_handle = await self.browser.page.query_selector('.cropper-point.point-se')
-            if se_handle:
+            se_handle = self.browser.page.locator('.cropper-point.point-se').first
+            if await se_handle.count():
                 box = await se_handle.bounding_box()
                 if box:
                     # クロッパーコンテナの範囲を取得
-                    container = await self.browser.page.query_selector('.cropper-container')
-                    if container:
+                    container = self.browser.page.locator('.cropper-container').first
+                    if await container.count():
                         container_box = await container.bounding_box()
                         if container_box:
                             target_x = container_box['x'] + container_box['width'] - 10
@@ -594,89 +857,96 @@ class LineAutomation:
         except Exception as e:
             self.log(f"⚠ クロップ調整スキップ: {e}")
     
-    async def _enable_messaging_api(self, basic_id: str):
-        """メッセージAPIを有効化"""
+    async def _enable_messaging_api(self, urls: AccountUrls, browser: Optional[StealthBrowser] = None):
+        """メッセージAPIを有効化（browserを指定した場合はそのタブで処理）"""
+        browser = browser or self.browser
         self.log("メッセージAPI有効化処理...")
         
         try:
             # Messaging API設定ページに移動
-            url = f"{LINE_MANAGER_URL}account/{basic_id}/setting/messaging-api"
-            await self.browser.navigate(url)
-            await asyncio.sleep(2)
+            await browser.navigate(urls.messaging_api)
             
             # 「Messaging APIを利用する」ボタンをクリック
-            await self.browser.human_click('button:has-text("Messaging APIを利用する")')
-            await self.browser.random_wait()
-            await asyncio.sleep(2)
+            await browser.human_click('button:has-text("Messaging APIを利用する")')
+            
+            # プロバイダー選択モーダルが表示されるまで待機
+            await self._wait_for_any([
+                'label.custom-control-label',
+                'input[name="providerName"]',
+                'button:has-text("同意する")',
+            ], page=browser.page)
             
             # プロバイダーを選択または入力
             if self.biz_manager_name:
                 # まず選択肢に組織名があるか確認
                 provider_label_selector = f'label.custom-control-label:has-text("{self.biz_manager_name}")'
-                provider_label = await self.browser.page.query_selector(provider_label_selector)
+                provider_label = browser.page.locator(provider_label_selector).first
                 
-                if provider_label:
+                if await provider_label.count():
                     # 選択肢がある場合はクリックして選択
                     self.log(f"プロバイダーを選択: {self.biz_manager_name}")
                     await provider_label.click(force=True)
-                    await self.browser.random_wait()
+                    await browser.random_wait()
                 else:
                     # 選択肢がない場合は入力フォームに入力
                     self.log(f"プロバイダー名を入力: {self.biz_manager_name}")
-                    provider_input = await self.browser.page.query_selector('input[name="providerName"]')
-                    if provider_input:
-                        await provider_input.fill('')  # クリア
-                        await self.browser.human_type('input[name="providerName"]', self.biz_manager_name)
-                        await self.browser.random_wait()
-            
-            await asyncio.sleep(1)
+                    if await browser.page.locator('input[name="providerName"]').count():
+                        await browser.fill('input[name="providerName"]', self.biz_manager_name)  # 既存の値は置き換え
+                        await browser.random_wait()
             
             # 同意するボタンをクリック
-            await self.browser.human_click('button:has-text("同意する")')
-            await self.browser.random_wait()
-            await asyncio.sleep(2)
+            await browser.human_click('button:has-text("同意する")')
+            await browser.random_wait()
             
-            # OKボタンを2回クリック
-            for _ in range(2):
-                if await self.browser.check_element_exists('button:has-text("OK")'):
-                    await self.browser.human_click('button:has-text("OK")')
-                    await self.browser.random_wait()
-                    await asyncio.sleep(1)
+            # OKボタンを2回クリック（2回目は出ていなければすぐに次へ）
+            for timeout in (5000, 1500):
+                if not await self._click_if_present(browser.page, 'button:has-text("OK")', timeout):
+                    break
+                await browser.random_wait()
             
             self.log("✓ メッセージAPI有効化完了")
             
         except Exception as e:
             self.log(f"⚠ メッセージAPI有効化エラー: {e}")
     
-    async def _add_permission(self, basic_id: str) -> str:
-        """権限追加リンクを取得"""
+    async def _get_links(self, urls: AccountUrls, browser: StealthBrowser) -> Tuple[str, str]:
+        """
+        権限追加リンクと友達追加リンクを同じタブで続けて取得
+        
+        Returns:
+            (権限追加リンク, 友達追加リンク)
+        """
+        permission_link = await self._add_permission(urls, browser)
+        friend_link = await self._get_friend_link(urls, browser)
+        return permission_link, friend_link
+    
+    async def _add_permission(self, urls: AccountUrls, browser: Optional[StealthBrowser] = None) -> str:
+        """権限追加リンクを取得（browserを指定した場合はそのタブで処理）"""
+        browser = browser or self.browser
         self.log("権限追加処理...")
         permission_link = ""
         
         try:
             # 権限設定ページに移動
-            url = f"{LINE_MANAGER_URL}account/{basic_id}/setting/user"
-            await self.browser.navigate(url)
+            await browser.navigate(urls.user)
             
             # メンバーを追加ボタンをクリック
-            await self.browser.human_click('button:has-text("メンバーを追加")')
-            await self.browser.random_wait()
+            await browser.human_click('button:has-text("メンバーを追加")')
+            await browser.random_wait()
             
             # 管理者を選択
-            await self.browser.select_option('#formPermissonType', 'ADMIN')
-            await self.browser.random_wait()
+            await browser.select_option('#formPermissonType', 'ADMIN')
+            await browser.random_wait()
             
             # URLを発行ボタンをクリック
-            await self.browser.human_click('button:has-text("URLを発行")')
-            await self.browser.random_wait(2000, 3000)
+            await browser.human_click('button:has-text("URLを発行")')
             
-            # 発行されたリンクを取得
-            input_element = await self.browser.page.wait_for_selector('input[readonly]')
-            permission_link = await input_element.input_value()
+            # 発行されたリンクが表示されるのを待って取得
+            permission_link = await browser.page.evaluate(_WAIT_READONLY_VALUE_JS, 10000)
             
             # 閉じるボタンをクリック
-            await self.browser.human_click('button:has-text("閉じる")')
-            await self.browser.random_wait()
+            await browser.human_click('button:has-text("閉じる")')
+            await browser.random_wait()
             
             self.log(f"✓ 権限追加リンク取得: {permission_link[:50]}...")
             
@@ -685,24 +955,24 @@ class LineAutomation:
         
         return permission_link
     
-    async def _get_friend_link(self, basic_id: str) -> str:
-        """友達追加リンクを取得"""
+    async def _get_friend_link(self, urls: AccountUrls, browser: Optional[StealthBrowser] = None) -> str:
+        """友達追加リンクを取得（browserを指定した場合はそのタブで処理）"""
+        browser = browser or self.browser
         self.log("友達追加リンク取得...")
         friend_link = ""
         
         try:
             # 友達追加URL設定ページに移動
-            url = f"{LINE_MANAGER_URL}account/{basic_id}/gainfriends/add-friend-url"
-            await self.browser.navigate(url)
+            await browser.navigate(urls.friend_url)
             
             # コピーボタンをクリック
-            await self.browser.human_click('button:has-text("コピー")')
-            await self.browser.random_wait()
+            await browser.human_click('button:has-text("コピー")')
+            await browser.random_wait()
             
             # クリップボードから取得する代わりに、表示されているURLを取得
             # 通常、入力欄かテキスト要素に表示されている
-            url_element = await self.browser.page.query_selector('input[readonly], .friend-url')
-            if url_element:
+            url_element = browser.page.locator('input[readonly], .friend-url').first
+            if await url_element.count():
                 friend_link = await url_element.input_value() or await url_element.text_content() or ""
             
             self.log(f"✓ 友達追加リンク取得: {friend_link}")
@@ -718,19 +988,22 @@ class LineAutomation:
         access_token = ""
         
         try:
-            # ① LINE Developers Consoleにアクセス
-            self.log("LINE Developers Consoleにアクセス...")
-            await self.browser.navigate(LINE_DEVELOPERS_URL)
-            await self.browser.wait_for_load()
-            await asyncio.sleep(3)
-            
-            # ② ビジネスマネージャーの組織名をクリック
-            if self.biz_manager_name:
-                self.log(f"組織を選択: {self.biz_manager_name}")
-                org_selector = f'.dc-provider-name:has-text("{self.biz_manager_name}")'
-                await self.browser.page.click(org_selector, timeout=10000)
-                await self.browser.wait_for_load()
-                await asyncio.sleep(2)
+            if self._provider_url:
+                # ①② 前回開いた組織のページに直接移動
+                self.log(f"組織のページに移動: {self.biz_manager_name}")
+                await self.browser.navigate(self._provider_url)
+            else:
+                # ① LINE Developers Consoleにアクセス
+                self.log("LINE Developers Consoleにアクセス...")
+                await self.browser.navigate(LINE_DEVELOPERS_URL)
+                
+                # ② ビジネスマネージャーの組織名をクリック
+                if self.biz_manager_name:
+                    self.log(f"組織を選択: {self.biz_manager_name}")
+                    org_selector = f'.dc-provider-name:has-text("{self.biz_manager_name}")'
+                    await self.browser.page.click(org_selector, timeout=10000)
+                    await self.browser.wait_for_load()
+                    self._provider_url = self.browser.url
             
             # ③ 公式LINE名のメニューをクリック
             self.log(f"チャンネルを選択: {line_name}")
@@ -741,156 +1014,114 @@ class LineAutomation:
                 # フォールバック: section全体をクリック
                 await self.browser.page.click(f'section:has-text("{line_name}")', timeout=5000)
             await self.browser.wait_for_load()
-            await asyncio.sleep(2)
             
             # ④ Messaging API設定タブをクリック（日本語/英語両対応）
             self.log("Messaging API設定タブをクリック...")
-            await asyncio.sleep(3)  # ページ読み込み待機
-            
-            # タブナビゲーション内のボタンをクリック
-            clicked = False
+            await self._wait_for_any([
+                'nav ul li button:has-text("Messaging API")',
+                '.kv-tabs button:has-text("Messaging")',
+            ])
             
-            # 日本語: "Messaging API設定"
+            # タブナビゲーション内のボタンをクリック（日本語: "Messaging API設定" / 英語: "Messaging API"）
+            page = self.browser.page
             try:
-                tab_jp = await self.browser.page.query_selector('nav ul li button:has-text("Messaging API設定")')
-                if tab_jp:
-                    await tab_jp.click(force=True)
-                    clicked = True
-                    self.log("Messaging API設定タブをクリック（日本語）")
+                await page.locator('nav ul li').get_by_role('button', name=_MESSAGING_API_TAB_NAME_RE).or_(
+                    page.locator('.kv-tabs button:has-text("Messaging")')
+                ).first.click(force=True, timeout=5000)
             except Exception:
-                pass
-            
-            # 英語: "Messaging API"（設定なし）
-            if not clicked:
-                try:
-                    tab_en = await self.browser.page.query_selector('nav ul li button:has-text("Messaging API")')
-                    if tab_en:
-                        await tab_en.click(force=True)
-                        clicked = True
-                        self.log("Messaging APIタブをクリック（英語）")
-                except Exception:
-                    pass
-            
-            # フォールバック
-            if not clicked:
-                try:
-                    await self.browser.page.click('.kv-tabs button:has-text("Messaging")', force=True, timeout=5000)
-                except Exception:
-                    await self.browser.page.click('text="Messaging API"', force=True, timeout=5000)
+                # フォールバック
+                await page.click('text="Messaging API"', force=True, timeout=5000)
             
             await self.browser.wait_for_load()
-            await asyncio.sleep(2)
+            await self._wait_for_any(['button:has-text("発行")', 'button:has-text("Issue")'])
             
             # ⑤ アクセストークン発行ボタンをクリック（日本語: 発行 / 英語: Issue）
+            # 発行APIのレスポンスを待ち受け、返ってきたJSONからトークンを取得する
             self.log("アクセストークンを発行...")
             try:
-                # 日本語「発行」
-                issue_btn_jp = await self.browser.page.query_selector('button:has-text("発行")')
-                if issue_btn_jp:
-                    await issue_btn_jp.click()
-                    self.log("発行ボタンをクリック（日本語）")
-                else:
-                    # 英語「Issue」
-                    await self.browser.page.click('button:has-text("Issue")', timeout=10000)
-                    self.log("Issueボタンをクリック（英語）")
-            except Exception:
-                await self.browser.page.click('button.kv-button:has-text("Issue")', timeout=10000)
-            await asyncio.sleep(2)
-            
-            # ⑥ アクセストークンを取得
-            self.log("アクセストークンを取得...")
-            await asyncio.sleep(3)
-            
-            # 戦略1: HTML全体からトークンらしい文字列を正規表現で探す
-            try:
-                # ページ内の怪しい要素をすべて取得
-                elements = await self.browser.page.query_selector_all('div, span, code, p')
+                async with page.expect_response(self._is_token_response, timeout=15000) as response_info:
+                    await page.get_by_role('button', name=_ISSUE_BUTTON_NAME_RE).or_(
+                        page.locator('button.kv-button:has-text("Issue")')
+                    ).first.click(timeout=10000)
+                response = await response_info.value
+                body = await response.json()
+                if isinstance(body, dict):
+                    access_token = body.get('access_token') or body.get('accessToken') or ""
+                if access_token:
+                    self.log(f"✓ アクセストークン発見 (APIレスポンス): {access_token[:30]}...")
+            except Exception as e:
+                self.log(f"発行APIのレスポンスを取得できません（画面から探します）: {e}")
+            
+            # ⑥ レスポンスから取得できなければ画面から探す（発行後に表示される再発行ボタンを待つ）
+            if not access_token:
+                self.log("アクセストークンを取得...")
+                await self._wait_for_any([
+                    'div.copyable',
+                    'button:has-text("再発行")',
+                    'button:has-text("Reissue")',
+                ])
                 
-                for el in elements:
-                    text = await el.text_content()
-                    if not text:
-                        continue
-                        
-                    text = text.strip()
-                    # Reissueなどのボタンテキストが混入している場合を除去
-                    if text.endswith("Reissue"):
-                        text = text[:-7].strip()
-                    elif text.endswith("再発行"):
-                        text = text[:-3].strip()
-                    
-                    # トークンの特徴: 100文字以上、英数字と記号のみ、スペースなし
-                    # 末尾が=で終わることを確認
-                    if len(text) > 100 and " " not in text and re.match(r'^[a-zA-Z0-9+/=]+$', text):
-                        access_token = text
+                # 戦略1: ページ内のテキストからトークンらしい文字列を探す
+                # 戦略2: 見つからなければdiv.copyableのcontent属性
+                # （要素ごとにドライバーと往復しないよう、探索はブラウザ側で1回の呼び出しで行う）
+                try:
+                    access_token = await page.evaluate(_TOKEN_SCAN_JS) or ""
+                    if access_token:
                         self.log(f"✓ アクセストークン発見 (テキスト解析): {access_token[:30]}...")
-                        break
                 
-                # 戦略2: もし上記で見つからなければ、特定のクラスを再度トライ
-                if not access_token:
-                    # div.copyableのcontent属性
-                    el = await self.browser.page.query_selector('div.copyable')
-                    if el:
-                        access_token = await el.get_attribute('content')
-            
-            except Exception as e:
-                self.log(f"トークン探索エラー: {e}")
+                except Exception as e:
+                    self.log(f"トークン探索エラー: {e}")
 
             if access_token:
                 access_token = access_token.strip()
                 self.log(f"✓ アクセストークン確定: {access_token[:20]}...")
             else:
                 self.log("⚠ アクセストークンの取得に失敗しました")
-                # デバッグ用：ページテキストの一部を保存（解析用）
-                content = await self.browser.page.content()
-                with open("debug_token_page.html", "w", encoding="utf-8") as f:
-                    f.write(content)
-                self.log("デバッグ用HTMLを保存しました: debug_token_page.html")
+                # デバッグ用：ページのHTMLを保存（解析用、DOM全体の転送になるため有効時のみ）
+                if self.debug_token:
+                    content = await page.content()
+                    await asyncio.to_thread(Path("debug_token_page.html").write_text, content, encoding="utf-8")
+                    self.log("デバッグ用HTMLを保存しました: debug_token_page.html")
             
         except Exception as e:
             self.log(f"⚠ アクセストークン取得エラー: {e}")
         
         return access_token
     
+    @staticmethod
+    def _is_token_response(response: Response) -> bool:
+        """チャンネルアクセストークン発行APIのレスポンスかどうか"""
+        return response.request.method == 'POST' and 'access-token' in response.url
+    
     async def _close_modal_popups(self):
         """モーダルポップアップを閉じる（「閉じる」ボタン優先）"""
-        for _ in range(5):
-            await asyncio.sleep(0.5)
+        page = self.browser.page
+        for _ in range(5):  # 続けて表示されるモーダルにも対応
+            # モーダルの確認と「閉じる」ボタンのクリックを1回の呼び出しで行う
+            try:
+                action = await page.evaluate(_CLOSE_MODAL_JS)
+            except Exception:
+                action = 'escape'
             
-            # モーダルが表示されているか確認
-            modal = await self.browser.page.query_selector('.modal-content, .modal.show')
-            if not modal:
+            if action == 'no_modal':
                 break
             
-            # 1. 「閉じる」ボタンを優先してクリック
-            try:
-                close_btn = await self.browser.page.query_selector('button.btn-secondary:has-text("閉じる")')
-                if close_btn:
-                    await close_btn.click(force=True)
-                    self.log("閉じるボタンでポップアップを閉じました")
-                    await asyncio.sleep(0.5)
-                    continue
-            except Exception:
-                pass
+            if action == 'closed':
+                self.log("閉じるボタンでポップアップを閉じました")
+            else:
+                # ESCキーで閉じる（フォールバック）
+                await page.keyboard.press('Escape')
             
-            # 2. 汎用の閉じるボタン
+            # モーダルが消えるのを待つ（消えた時点ですぐ次の確認へ）
             try:
-                close_btn2 = await self.browser.page.query_selector('button:has-text("閉じる")')
-                if close_btn2:
-                    await close_btn2.click(force=True)
-                    self.log("閉じるボタンでポップアップを閉じました")
-                    await asyncio.sleep(0.5)
-                    continue
-            except Exception:
+                await page.wait_for_selector('.modal-content, .modal.show', state='hidden', timeout=3000)
+            except PlaywrightTimeoutError:
                 pass
-            
-            # 3. ESCキーで閉じる（フォールバック）
-            await self.browser.page.keyboard.press('Escape')
-            await asyncio.sleep(0.5)
     
     def _extract_basic_id(self, url: str) -> str:
         """URLからベーシックIDを抽出"""
-        match = re.search(r'(@[a-zA-Z0-9]+)', url)
-        return match.group(1) if match else ""
+        match = _BASIC_ID_RE.search(url)
+        return match.group(0) if match else ""
     
     async def process_account(
         self,
@@ -913,49 +1144,144 @@ class LineAutomation:
         """
         result = await self.create_account(account, image_path)
         
-        # スプレッドシートに結果を書き戻す
+        # スプレッドシートに結果を書き戻す（この行の更新は1回のAPIリクエストにまとめる）
         if result.success:
-            # ベーシックID
-            if result.basic_id and column_config.get('col_basic_id', '-') != '-':
-                sheet_reader.update_cell(
-                    account.row_number,
-                    column_config['col_basic_id'],
-                    result.basic_id
-                )
-            
-            # 権限追加リンク
-            if result.permission_link and column_config.get('col_permission_link', '-') != '-':
-                sheet_reader.update_cell(
-                    account.row_number,
-                    column_config['col_permission_link'],
-                    result.permission_link
-                )
-            
-            # 友達追加リンク
-            if result.friend_link and column_config.get('col_friend_link', '-') != '-':
-                sheet_reader.update_cell(
-                    account.row_number,
-                    column_config['col_friend_link'],
-                    result.friend_link
-                )
-            
-            # アクセストークン
-            if result.access_token and column_config.get('col_access_token', '-') != '-':
-                sheet_reader.update_cell(
-                    account.row_number,
-                    column_config['col_access_token'],
-                    result.access_token
-                )
+            for attr, key in _WRITEBACK_MAP:
+                col = column_config.get(key, '-')
+                value = getattr(result, attr)
+                if value and col != '-':
+                    sheet_reader.queue_update(account.row_number, col, value)
             
             # ビジネスアカウント（ログイン用メールアドレス）
             if column_config.get('col_business_account', '-') != '-':
-                sheet_reader.update_cell(
+                sheet_reader.queue_update(
                     account.row_number,
                     column_config['col_business_account'],
                     self.email
                 )
+            
+            await sheet_reader.flush_updates_async()
         
-        # 不要なタブを閉じる（現在のタブ以外）
-        await self.browser.close_other_tabs()
+        # 不要なタブを閉じる（現在のタブ以外、TAB_CLEANUP_INTERVAL件ごとにまとめて）
+        self._accounts_since_cleanup += 1
+        if (self._accounts_since_cleanup >= TAB_CLEANUP_INTERVAL
+                or len(self.browser.context.pages) > TAB_CLEANUP_INTERVAL):
+            await self.browser.close_other_tabs()
+            self._accounts_since_cleanup = 0
         
         return result
+
+
+class LineAutomationPool:
+    """
+    1つのブラウザを共有し、コンテキストごとのLineAutomationを貸し出すプール
+    
+    1台目でログインしたストレージ状態を残りのコンテキストに引き継ぐため、
+    ブラウザの起動とログインは1回で済む
+    """
+    
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        headless: bool = False,
+        biz_manager_name: str = "",
+        on_status_update: Optional[Callable[[str], None]] = None,
+        on_captcha_required: Optional[Callable[[], asyncio.Future]] = None,
+        debug_token: bool = False
+    ):
+        """
+        Args:
+            email: ログインメールアドレス
+            password: ログインパスワード
+            headless: ヘッドレスモードで実行するか
+            biz_manager_name: ビジネスマネージャーの組織名（設定されている場合）
+            on_status_update: ステータス更新コールバック
+            on_captcha_required: CAPTCHA検知時のコールバック（Futureを返す）
+            debug_token: アクセストークン取得失敗時にページのHTMLを保存するか
+        """
+        self.email = email
+        self.password = password
+        self.headless = headless
+        self.debug_token = debug_token
+        self.biz_manager_name = biz_manager_name
+        self.on_status_update = on_status_update or (lambda x: print(x))
+        self.on_captcha_required = on_captcha_required
+        
+        self.automations: List[LineAutomation] = []
+        self._browsers: Optional[StealthBrowserPool] = None
+        self._idle: asyncio.Queue = asyncio.Queue()
+    
+    def log(self, message: str):
+        """ステータスログ"""
+        self.on_status_update(message)
+    
+    def _create(self, browser: Optional[StealthBrowser] = None) -> LineAutomation:
+        """プールの設定でLineAutomationを作成"""
+        return LineAutomation(
+            email=self.email,
+            password=self.password,
+            headless=self.headless,
+            biz_manager_name=self.biz_manager_name,
+            on_status_update=self.on_status_update,
+            on_captcha_required=self.on_captcha_required,
+            browser=browser,
+            debug_token=self.debug_token
+        )
+    
+    async def start(self, size: int) -> bool:
+        """
+        ブラウザを起動・ログインし、size個のコンテキストを用意
+        
+        Args:
+            size: 同時に処理するアカウント数
+            
+        Returns:
+            1つ以上のコンテキストを用意できたかどうか
+        """
+        self._browsers = StealthBrowserPool(headless=self.headless, max_contexts=size - 1)
+        primary = self._create(self._browsers.primary)  # start()でブラウザを起動する
+        self.automations.append(primary)  # 後片付けの対象
+        
+        if not await primary.start():
+            self.log("✗ ブラウザ起動失敗")
+            return False
+        
+        if not await primary.login():
+            self.log("✗ ログイン失敗")
+            return False
+        
+        # ログイン済みの状態を残りのコンテキストに引き継ぐ
+        if size > 1:
+            storage_state = await primary.browser.context.storage_state()
+            siblings = await asyncio.gather(
+                *(self._browsers.open(storage_state) for _ in range(size - 1))
+            )
+            for browser in siblings:
+                if browser:
+                    automation = self._create(browser)
+                    await automation.start()  # 起動済みのため監視の登録のみ
+                    automation.is_logged_in = True
+                    self.automations.append(automation)
+        
+        for automation in self.automations:
+            self._idle.put_nowait(automation)
+        return True
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[LineAutomation]:
+        """空いているLineAutomationを借りる（すべて使用中なら空くまで待機）"""
+        automation = await self._idle.get()
+        try:
+            yield automation
+        finally:
+            self._idle.put_nowait(automation)
+    
+    async def stop(self):
+        """すべてのコンテキストとブラウザを閉じる（共有ブラウザは最後に閉じる）"""
+        if not self.automations:
+            return
+        primary, *siblings = self.automations
+        await asyncio.gather(*(self._browsers.release(a.browser) for a in siblings))
+        await primary.stop()
+        self.automations = []
@@ -3,11 +3,12 @@
 ログイン状態（Cookie/LocalStorage）を保存・復元
 """
 
-import json
+import asyncio
 from pathlib import Path
 from typing import Optional, Dict, Any
 
 from config.settings import SESSION_FILE
+from .json_io import read_json, write_json
 
 
 class SessionManager:
@@ -38,9 +39,7 @@ class SessionManager:
             }
             
             self.session_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.session_file, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, ensure_ascii=False, indent=2)
+            write_json(self.session_file, session_data)
             
             print(f"✓ セッション保存: {self.session_file}")
             return True
@@ -60,8 +59,7 @@ class SessionManager:
             if not self.session_file.exists():
                 return None
             
-            with open(self.session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            session_data = read_json(self.session_file)
             
             print(f"✓ セッション読み込み: {self.session_file}")
             return session_data
@@ -70,6 +68,38 @@ class SessionManager:
             print(f"✗ セッション読み込みエラー: {e}")
             return None
     
+    def load_storage_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Playwrightのコンテキストにそのまま渡せる形式でセッションを読み込み
+        
+        Returns:
+            ストレージ状態（なければNone）
+        """
+        if not self.has_session():
+            return None
+        
+        session_data = self.load_session()
+        if not session_data:
+            return None
+        
+        storage_state = session_data.get("storage_state") or {}
+        if "cookies" not in storage_state:
+            # Cookieのみを保存していた形式
+            storage_state = {"cookies": session_data.get("cookies", []), "origins": []}
+        return storage_state
+    
+    async def save_session_async(self, cookies: list, storage_state: Dict[str, Any] = None) -> bool:
+        """save_session をイベントループを塞がずに実行"""
+        return await asyncio.to_thread(self.save_session, cookies, storage_state)
+    
+    async def load_session_async(self) -> Optional[Dict[str, Any]]:
+        """load_session をイベントループを塞がずに実行"""
+        return await asyncio.to_thread(self.load_session)
+    
+    async def load_storage_state_async(self) -> Optional[Dict[str, Any]]:
+        """load_storage_state をイベントループを塞がずに実行"""
+        return await asyncio.to_thread(self.load_storage_state)
+    
     def has_session(self) -> bool:
         """保存されたセッションがあるか"""
         return self.session_file.exists()
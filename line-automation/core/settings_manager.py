@@ -3,12 +3,13 @@
 ユーザー設定をJSONファイルに保存・読み込み
 """
 
-import json
+import asyncio
 from pathlib import Path
 from typing import Any, Dict, Optional
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 
 from config.settings import APP_SETTINGS_FILE
+from .json_io import dumps, read_json
 
 
 @dataclass
@@ -41,6 +42,10 @@ class LineSettings:
     headless_mode: bool = False
 
 
+# LineSettingsのフィールド名（保存時にasdictで再帰的にコピーしないよう一度だけ取得）
+_LINE_FIELDS = tuple(f.name for f in fields(LineSettings))
+
+
 @dataclass
 class AppSettings:
     """アプリ全体の設定"""
@@ -60,13 +65,32 @@ class SettingsManager:
         """
         self.settings_file = settings_file or APP_SETTINGS_FILE
         self._settings: Optional[AppSettings] = None
+        self._mtime: Optional[float] = None  # 読み込み/保存時点のファイル更新時刻
+    
+    def _get_mtime(self) -> Optional[float]:
+        """設定ファイルの更新時刻を取得（なければNone）"""
+        try:
+            return self.settings_file.stat().st_mtime
+        except OSError:
+            return None
     
-    def load(self) -> AppSettings:
-        """設定を読み込む"""
-        if self.settings_file.exists():
+    def load(self, force_reload: bool = False) -> AppSettings:
+        """
+        設定を読み込む
+        
+        ファイルが前回の読み込み/保存から変更されていなければキャッシュを返す
+        
+        Args:
+            force_reload: Trueの場合はキャッシュを使わずファイルを読み直す
+        """
+        mtime = self._get_mtime()
+        if not force_reload and self._settings is not None and mtime == self._mtime:
+            return self._settings
+        self._mtime = mtime
+        
+        if mtime is not None:
             try:
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_json(self.settings_file)
                 
                 # LineSettingsを復元
                 line_data = data.get('line_settings', {})
@@ -98,22 +122,39 @@ class SettingsManager:
             # ディレクトリを作成
             self.settings_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # dataclassをdictに変換
+            # dataclassをdictに変換（フィールドはすべて単純な値なので浅いコピーで十分）
+            line_settings = settings.line_settings
             data = {
-                'line_settings': asdict(settings.line_settings),
+                'line_settings': {name: getattr(line_settings, name) for name in _LINE_FIELDS},
                 'proline_settings': settings.proline_settings
             }
             
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            content = dumps(data)
+            
+            # 内容が変わっていなければ書き込みを省略
+            try:
+                unchanged = self.settings_file.read_bytes() == content
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                self.settings_file.write_bytes(content)
             
             self._settings = settings
+            self._mtime = self._get_mtime()
             return True
             
         except Exception as e:
             print(f"設定の保存に失敗: {e}")
             return False
     
+    async def load_async(self, force_reload: bool = False) -> AppSettings:
+        """load をイベントループを塞がずに実行"""
+        return await asyncio.to_thread(self.load, force_reload)
+    
+    async def save_async(self, settings: AppSettings) -> bool:
+        """save をイベントループを塞がずに実行"""
+        return await asyncio.to_thread(self.save, settings)
+    
     @property
     def settings(self) -> AppSettings:
         """現在の設定を取得"""
@@ -4,10 +4,14 @@ Google Sheets クライアントモジュール
 """
 
 import re
+import asyncio
+import operator
+import string
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterator
 from dataclasses import dataclass
 import gspread
+from gspread.utils import absolute_range_name
 from google.oauth2.service_account import Credentials
 
 from config.settings import (
@@ -18,6 +22,72 @@ from config.settings import (
 )
 
 
+# スプレッドシートID抽出用の正規表現（コンパイル済み）
+_ID_RE_1 = re.compile(r'/d/([a-zA-Z0-9-_]+)')
+_ID_RE_2 = re.compile(r'key=([a-zA-Z0-9-_]+)')
+
+# 有効行から抽出する列（col_indicesのキー、AccountRowの並び順）
+_ROW_FIELDS = (
+    'line_name',
+    'icon_image',
+    'basic_id',
+    'access_token',
+    'permission_link',
+    'friend_link',
+    'business_account',
+)
+
+# 有効値の判定用（大文字化済みの集合と、候補を絞り込むための先頭文字）
+# 先頭が空白のセルは strip() 後に判定するため、ここに含めず isspace() で候補に残す
+_ENABLED_SET = frozenset(v.upper() for v in ENABLED_VALUES)
+_ENABLED_PREFIX = frozenset(
+    {v[0] for v in _ENABLED_SET}
+    | {v[0].lower() for v in _ENABLED_SET}
+)
+
+
+def is_enabled(value: str) -> bool:
+    """セルの値が有効を表すかどうか（前後の空白・大文字小文字を無視）"""
+    return value.strip().upper() in _ENABLED_SET
+
+
+# 列選択用のオプション（ブランク + A〜AZ）
+_COLUMN_OPTIONS = (
+    "-",  # 先頭にブランク（ハイフンで表示）
+    *string.ascii_uppercase,
+    *(f"A{c}" for c in string.ascii_uppercase),
+)
+
+
+def _letter_to_index(letter: str) -> int:
+    """列文字をインデックスに変換（A=0, B=1, ..., AA=26, AB=27, ...）"""
+    if not letter or letter == "-":
+        return -1
+    
+    result = 0
+    for char in letter.upper():
+        result = result * 26 + (ord(char) - ord('A') + 1)
+    return result - 1  # 0始まりに変換
+
+
+def _index_to_letter(index: int) -> str:
+    """インデックスを列文字に変換（0=A, 1=B, ..., 26=AA, ...）"""
+    if 0 <= index < len(_COLUMN_OPTIONS) - 1:
+        return _COLUMN_OPTIONS[index + 1]
+    
+    letters = ""
+    index += 1
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+
+# 列文字 -> インデックスの変換表（選択肢に含まれる列は計算不要）
+_COL_LETTER_TO_INDEX: Dict[str, int] = {"": -1}
+_COL_LETTER_TO_INDEX.update((letter, _letter_to_index(letter)) for letter in _COLUMN_OPTIONS)
+
+
 @dataclass
 class AccountRow:
     """スプレッドシートの1行分のデータ"""
@@ -52,6 +122,15 @@ class SheetsClient:
         # インスタンス変数としてスプレッドシート状態を保持（統合用）
         self.spreadsheet: Optional[gspread.Spreadsheet] = None
         self.worksheet: Optional[gspread.Worksheet] = None
+        
+        # まとめて書き込むためのセル更新キュー
+        self._pending_updates: List[Dict] = []
+        
+        # 取得範囲ごとのシート値のキャッシュ（get_enabled_rowsの再取得を避ける）
+        self._values_cache: Dict[str, List[List[str]]] = {}
+        
+        # 列設定ごとの列インデックスのキャッシュ
+        self._col_indices_cache: Dict[frozenset, Dict[str, int]] = {}
     
     def _get_client(self) -> gspread.Client:
         """認証済みクライアントを取得"""
@@ -74,12 +153,12 @@ class SheetsClient:
             スプレッドシートID、抽出失敗時はNone
         """
         # パターン1: /d/SPREADSHEET_ID/
-        match = re.search(r'/d/([a-zA-Z0-9-_]+)', url)
+        match = _ID_RE_1.search(url)
         if match:
             return match.group(1)
         
         # パターン2: key=SPREADSHEET_ID
-        match = re.search(r'key=([a-zA-Z0-9-_]+)', url)
+        match = _ID_RE_2.search(url)
         if match:
             return match.group(1)
         
@@ -146,6 +225,7 @@ class SheetsClient:
             
             self.spreadsheet = client.open_by_key(spreadsheet_id)
             self.worksheet = self.spreadsheet.worksheet(sheet_name)
+            self.invalidate_cache()
             
             return True
         except Exception as e:
@@ -154,84 +234,138 @@ class SheetsClient:
 
     def _col_letter_to_index(self, letter: str) -> int:
         """列文字をインデックスに変換（A=0, B=1, ..., AA=26, AB=27, ...）"""
-        if not letter or letter == "-":
-            return -1
+        index = _COL_LETTER_TO_INDEX.get(letter.upper() if letter else "")
+        if index is None:
+            # 変換表にない列（BA以降など）は都度計算
+            index = _letter_to_index(letter)
+        return index
+
+    def _get_col_indices(self, column_config: Dict[str, str]) -> Dict[str, int]:
+        """列設定から各フィールドの列インデックスを取得（列設定ごとにキャッシュ）"""
+        key = frozenset(column_config.items())
+        col_indices = self._col_indices_cache.get(key)
+        if col_indices is None:
+            col_indices = {
+                'enabled': self._col_letter_to_index(column_config.get('col_enabled', '')),
+                'line_name': self._col_letter_to_index(column_config.get('col_line_name', '')),
+                'icon_image': self._col_letter_to_index(column_config.get('col_icon_image', '')),
+                'basic_id': self._col_letter_to_index(column_config.get('col_basic_id', '')),
+                'access_token': self._col_letter_to_index(column_config.get('col_access_token', '')),
+                'permission_link': self._col_letter_to_index(column_config.get('col_permission_link', '')),
+                'friend_link': self._col_letter_to_index(column_config.get('col_friend_link', '')),
+                'business_account': self._col_letter_to_index(column_config.get('col_business_account', '')),
+            }
+            self._col_indices_cache[key] = col_indices
+        return col_indices
+
+    def invalidate_cache(self):
+        """シート値のキャッシュを破棄（書き込み後など）"""
+        self._values_cache = {}
+
+    def _get_values(self, max_col_idx: int, refresh: bool = False) -> List[List[str]]:
+        """
+        A列〜使用する最大列までの値を取得（キャッシュがあれば再利用）
         
-        result = 0
-        for char in letter.upper():
-            result = result * 26 + (ord(char) - ord('A') + 1)
-        return result - 1  # 0始まりに変換
-
-    def _get_cell_value(self, row: List[str], col_idx: int) -> str:
-        """セルの値を安全に取得"""
-        if col_idx < 0 or col_idx >= len(row):
-            return ""
-        return row[col_idx].strip()
-
-    def get_enabled_rows(self, column_config: Dict[str, str]) -> List[AccountRow]:
+        シート全体ではなく必要な列範囲だけを values_get で取得する。
+        """
+        # シート名に ' が含まれていても正しい範囲になるよう gspread でエスケープする
+        range_name = absolute_range_name(self.worksheet.title, f"A1:{_index_to_letter(max_col_idx)}")
+        values = None if refresh else self._values_cache.get(range_name)
+        if values is None:
+            response = self.spreadsheet.values_get(range_name)
+            values = response.get('values', [])
+            self._values_cache[range_name] = values
+        return values
+
+    def get_enabled_rows(self, column_config: Dict[str, str], refresh: bool = False) -> List[AccountRow]:
         """
         有効になっている行のデータを取得
         
         Args:
             column_config: 列設定（キー: フィールド名, 値: 列文字）
+            refresh: Trueの場合はキャッシュを使わずシートを再取得
             
         Returns:
             有効な行のリスト（最大100件）
         """
+        return list(self.iter_enabled_rows(column_config, refresh))
+
+    def iter_enabled_rows(self, column_config: Dict[str, str], refresh: bool = False) -> Iterator[AccountRow]:
+        """
+        有効になっている行を1行ずつ返すジェネレータ
+        
+        シートの値は最初の行を返す前に範囲全体をまとめて取得する（1行ずつ受け取るための簡易API）。
+        
+        Args:
+            column_config: 列設定（キー: フィールド名, 値: 列文字）
+            refresh: Trueの場合はキャッシュを使わずシートを再取得
+            
+        Yields:
+            有効な行（最大MAX_ACCOUNTS件）
+        """
         if not self.worksheet:
             raise ValueError("スプレッドシートに接続していません")
         
-        # すべてのデータを取得
-        all_values = self.worksheet.get_all_values()
+        # 列インデックスを計算
+        col_indices = self._get_col_indices(column_config)
+        
+        enabled_idx = col_indices['enabled']
+        if enabled_idx < 0:
+            return
+        
+        # 使用する列の範囲だけを取得
+        max_col_idx = max(col_indices.values())
+        all_values = self._get_values(max_col_idx, refresh)
         
         # ヘッダー行のチェック
         if len(all_values) < HEADER_ROWS + 1:
-            return []
-        
-        # 列インデックスを計算
-        col_indices = {
-            'enabled': self._col_letter_to_index(column_config.get('col_enabled', '')),
-            'line_name': self._col_letter_to_index(column_config.get('col_line_name', '')),
-            'icon_image': self._col_letter_to_index(column_config.get('col_icon_image', '')),
-            'basic_id': self._col_letter_to_index(column_config.get('col_basic_id', '')),
-            'access_token': self._col_letter_to_index(column_config.get('col_access_token', '')),
-            'permission_link': self._col_letter_to_index(column_config.get('col_permission_link', '')),
-            'friend_link': self._col_letter_to_index(column_config.get('col_friend_link', '')),
-            'business_account': self._col_letter_to_index(column_config.get('col_business_account', '')),
-        }
+            return
         
-        enabled_rows = []
+        # 未設定の列(-1)は行末に足す空セルを参照させ、1回の呼び出しで全列を取り出す
+        pad_idx = max_col_idx + 1
+        row_width = pad_idx + 1
+        getter = operator.itemgetter(
+            *(col_indices[name] if col_indices[name] >= 0 else pad_idx for name in _ROW_FIELDS)
+        )
         
         # ヘッダー行を除いてデータ行を処理（行番号はHEADER_ROWS+1から開始）
+        count = 0
         for row_idx, row in enumerate(all_values[HEADER_ROWS:], start=HEADER_ROWS + 1):
-            if len(enabled_rows) >= MAX_ACCOUNTS:
+            if count >= MAX_ACCOUNTS:
                 break
             
             # 有効/無効チェック
-            enabled_idx = col_indices['enabled']
-            if enabled_idx < 0 or enabled_idx >= len(row):
+            if enabled_idx >= len(row):
                 continue
             
-            enabled_value = row[enabled_idx].strip().upper()
-            if enabled_value not in ENABLED_VALUES:
+            # 先頭文字で候補を絞ってから正規化して比較する
+            cell = row[enabled_idx]
+            c = cell[:1]
+            if c not in _ENABLED_PREFIX and not c.isspace():
+                continue
+            if not is_enabled(cell):
                 continue
             
+            # 短い行は空セルで埋める
+            if len(row) < row_width:
+                row = row + [""] * (row_width - len(row))
+            
             # データを抽出
-            account = AccountRow(
+            (line_name, icon_image_url, basic_id, access_token,
+             permission_link, friend_link, business_account) = (v.strip() for v in getter(row))
+            
+            count += 1
+            yield AccountRow(
                 row_number=row_idx,
                 enabled=True,
-                line_name=self._get_cell_value(row, col_indices['line_name']),
-                icon_image_url=self._get_cell_value(row, col_indices['icon_image']),
-                basic_id=self._get_cell_value(row, col_indices['basic_id']),
-                access_token=self._get_cell_value(row, col_indices['access_token']),
-                permission_link=self._get_cell_value(row, col_indices['permission_link']),
-                friend_link=self._get_cell_value(row, col_indices['friend_link']),
-                business_account=self._get_cell_value(row, col_indices['business_account']),
+                line_name=line_name,
+                icon_image_url=icon_image_url,
+                basic_id=basic_id,
+                access_token=access_token,
+                permission_link=permission_link,
+                friend_link=friend_link,
+                business_account=business_account,
             )
-            
-            enabled_rows.append(account)
-        
-        return enabled_rows
 
     def update_cell(self, row: int, col_letter: str, value: str) -> bool:
         """
@@ -251,11 +385,67 @@ class SheetsClient:
         try:
             cell = f"{col_letter}{row}"
             self.worksheet.update_acell(cell, value)
+            self.invalidate_cache()
             return True
         except Exception as e:
             print(f"セル更新エラー ({cell}): {e}")
             return False
 
+    def queue_update(self, row: int, col_letter: str, value: str):
+        """
+        セル更新をキューに追加（flush_updatesでまとめて書き込む）
+        
+        Args:
+            row: 行番号（1始まり）
+            col_letter: 列文字（例: "A", "B", "AA"）
+            value: 設定する値
+        """
+        self._pending_updates.append({
+            'range': f"{col_letter}{row}",
+            'values': [[value]],
+        })
+
+    def flush_updates(self) -> bool:
+        """
+        キューに溜まったセル更新を1回のAPIリクエストで書き込む
+        
+        Returns:
+            更新成功かどうか
+        """
+        updates, self._pending_updates = self._pending_updates, []
+        return self._send_updates(updates)
+
+    async def flush_updates_async(self) -> bool:
+        """
+        flush_updates をイベントループを塞がずに実行
+        
+        キューはこの時点で取り出すため、書き込み中に他のアカウントが追加した更新は次回の書き込みに回る
+        
+        Returns:
+            更新成功かどうか
+        """
+        updates, self._pending_updates = self._pending_updates, []
+        return await asyncio.to_thread(self._send_updates, updates)
+
+    def _send_updates(self, updates: List[Dict]) -> bool:
+        """セル更新のリストを1回のAPIリクエストで書き込む"""
+        if not updates:
+            return True
+        if not self.worksheet:
+            return False
+        
+        try:
+            self.worksheet.batch_update(
+                updates,
+                value_input_option='USER_ENTERED'
+            )
+            self.invalidate_cache()
+            return True
+        except Exception as e:
+            ranges = ", ".join(u['range'] for u in updates)
+            print(f"セル一括更新エラー ({ranges}): {e}")
+            return False
+
 
 def get_column_options() -> List[str]:
     """
@@ -264,14 +454,4 @@ def get_column_options() -> List[str]:
     Returns:
         ["", "A", "B", ..., "Z", "AA", "AB", ..., "AZ"]
     """
-    columns = ["-"]  # 先頭にブランク（ハイフンで表示）
-    
-    # A-Z
-    for i in range(26):
-        columns.append(chr(65 + i))
-    
-    # AA-AZ
-    for i in range(26):
-        columns.append("A" + chr(65 + i))
-    
-    return columns
+    return list(_COLUMN_OPTIONS)
@@ -4,13 +4,14 @@ Playwrightを使用したボット検知回避ブラウザ
 """
 
 import asyncio
+import functools
 import random
-from typing import Optional, List
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+import re
+from typing import Optional, List, Dict, Any, Tuple
+from playwright.async_api import async_playwright, Browser, BrowserContext, Locator, Page, Route, TimeoutError as PlaywrightTimeoutError
 from playwright_stealth import Stealth
 
 from config.settings import (
-    BROWSER_ARGS,
     DEFAULT_VIEWPORT,
     LOCALE,
     TIMEZONE,
@@ -19,11 +20,79 @@ from config.settings import (
     TYPING_DELAY_MIN,
     TYPING_DELAY_MAX,
     BEZIER_CONTROL_OFFSET,
+    MOUSE_MOVE_STEPS_SHORT,
+    MOUSE_PIXELS_PER_STEP,
+    MOUSE_DIRECT_MOVE_DISTANCE,
+    BLOCKED_URL_PATTERNS,
+    BLOCKED_IMAGE_EXTENSIONS,
+    ALLOWED_URL_PATTERNS,
     get_random_user_agent,
+    get_random_typing_burst,
     get_random_mouse_steps,
+    get_browser_args,
 )
 
 
+# 読み込みを止めるURL（すべてのリクエストにルートを掛けるとキャッシュが効かないため、対象のURLだけに絞る）
+_BLOCKED_URL_RE = re.compile('|'.join(re.escape(pattern) for pattern in BLOCKED_URL_PATTERNS))
+_BLOCKED_IMAGE_RE = re.compile(
+    r'\.(?:' + '|'.join(BLOCKED_IMAGE_EXTENSIONS) + r')(?:[?#]|$)', re.IGNORECASE
+)
+
+
+# playwright_stealthに加えて適用する偽装スクリプト（他のスクリプトと変数名が衝突しないよう関数で囲む）
+_AUTOMATION_PATCH_JS = """
+(() => {
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    
+    // Chromeの自動化検出を回避
+    window.chrome = {
+        runtime: {}
+    };
+    
+    // 権限の偽装（インスタンスではなくプロトタイプのメソッドを差し替える）
+    const proto = window.Permissions && Permissions.prototype;
+    if (!proto) return;
+    const originalQuery = proto.query;
+    proto.query = function (parameters) {
+        if (parameters && parameters.name === 'notifications') {
+            return Promise.resolve({ state: Notification.permission });
+        }
+        return originalQuery.call(this, parameters);
+    };
+})();
+"""
+
+# ステルス設定のスクリプトをまとめたもの（フレームごとに1つのスクリプトとして実行される）
+_STEALTH_INIT_JS = Stealth().script_payload + "\n" + _AUTOMATION_PATCH_JS
+
+# マウス移動の各点の間で待つ時間の候補（ミリ秒）
+_MOUSE_MOVE_DELAYS_MS = range(5, 16)
+
+
+@functools.lru_cache(maxsize=None)
+def _bernstein_table(steps: int) -> Tuple[Tuple[float, float, float, float], ...]:
+    """
+    3次ベジェ曲線の各ステップでの重み（バーンスタイン基底）を取得
+    
+    ステップ数ごとに一度だけ計算する（ステップ数の種類はMOUSE_MOVE_STEPS_MIN〜MAXの範囲のみ）
+    
+    Args:
+        steps: 分割数
+        
+    Returns:
+        t = 0〜1 の各点での ((1-t)^3, 3(1-t)^2 t, 3(1-t) t^2, t^3)
+    """
+    table = []
+    for i in range(steps + 1):
+        t = i / steps
+        u = 1 - t
+        table.append((u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t))
+    return tuple(table)
+
+
 class StealthBrowser:
     """隠蔽型ブラウザクラス"""
     
@@ -37,22 +106,77 @@ class StealthBrowser:
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self.pages: List[Page] = []
+        self._pages: Dict[int, Page] = {}  # 管理中のタブ（id(page) -> Page、開いた順）
+        self._owns_browser = True  # Falseの場合はspawn()で作成した共有ブラウザのコンテキスト
+        self._parent: Optional['StealthBrowser'] = None  # open_view()で作成した場合の元のブラウザ
+        self._views: List['StealthBrowser'] = []  # open_view()で作成した別タブ
+        self.load_images = False  # Trueの間はこのブラウザのタブ（open_view()の別タブを除く）だけ画像を読み込む（アイコンのクロップ時など）
+        
+        # ビューポートはインスタンスごとに1回だけ決めて使い回す
+        self._viewport: Dict[str, int] = dict(DEFAULT_VIEWPORT)
+        
+        # 操作用ヘルパーで使うLocator（セレクタ -> Locator、ページが切り替わったら作り直す）
+        self._locators: Dict[str, Locator] = {}
+        self._locator_page: Optional[Page] = None
+        
+        # このインスタンス専用の乱数生成器（並列で動く他のコンテキストと状態を共有しない）
+        self._rng = random.Random()
+        
+        # 最後にマウスを移動したページと座標（ページごとにカーソル位置は別）
+        self._last_mouse: Optional[Tuple[Page, float, float]] = None
+    
+    @property
+    def viewport(self) -> Dict[str, int]:
+        """このブラウザのビューポートサイズ"""
+        return self._viewport
+    
+    @property
+    def pages(self) -> List[Page]:
+        """管理中のタブ（開いた順）"""
+        return list(self._pages.values())
+    
+    def _track_page(self, page: Page):
+        """タブを管理対象に追加"""
+        self._pages[id(page)] = page
+    
+    def _loc(self, selector: str) -> Locator:
+        """
+        現在のページでセレクタに最初に一致する要素のLocatorを取得
+        
+        Locatorは操作のたびに要素を探し直すため、ページ内の遷移があっても使い回せる
+        （タブが切り替わった場合のみ作り直す）
+        
+        Args:
+            selector: セレクタ
+        """
+        if self._locator_page is not self.page:
+            self._locators = {}
+            self._locator_page = self.page
+        locator = self._locators.get(selector)
+        if locator is None:
+            locator = self._locators[selector] = self.page.locator(selector).first
+        return locator
     
-    async def launch(self) -> bool:
+    async def launch(self, storage_state: Optional[Dict[str, Any]] = None) -> bool:
         """
         ブラウザを起動
         
+        Args:
+            storage_state: コンテキスト作成時に読み込むストレージ状態（保存済みのセッション等）
+        
         Returns:
             起動成功かどうか
         """
         try:
             self.playwright = await async_playwright().start()
             
+            # ウィンドウサイズとビューポートを同じ解像度にそろえる
+            width, height = self._viewport['width'], self._viewport['height']
+            
             # ブラウザ起動オプション
             launch_options = {
                 'headless': self.headless,
-                'args': BROWSER_ARGS,
+                'args': get_browser_args(width, height),
             }
             
             # Chromeを優先して使用
@@ -65,52 +189,125 @@ class StealthBrowser:
                 # Chromeがない場合はChromiumを使用
                 self.browser = await self.playwright.chromium.launch(**launch_options)
             
-            # コンテキスト作成（設定値を使用）
-            self.context = await self.browser.new_context(
-                viewport=DEFAULT_VIEWPORT,
-                user_agent=get_random_user_agent(),
-                locale=LOCALE,
-                timezone_id=TIMEZONE,
-            )
-            
-            # 新しいページを作成
-            self.page = await self.context.new_page()
-            self.pages.append(self.page)
-            
-            # ステルスモードを適用
-            stealth = Stealth()
-            await stealth.apply_stealth_async(self.page)
-            
-            # navigator.webdriverを偽装
-            await self.page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                
-                // Chromeの自動化検出を回避
-                window.chrome = {
-                    runtime: {}
-                };
-                
-                // 権限の偽装
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-            """)
-            
+            await self._open_context(storage_state)
             return True
             
         except Exception as e:
             print(f"ブラウザ起動エラー: {e}")
             return False
     
+    async def spawn(self, storage_state: Optional[Dict[str, Any]] = None) -> Optional['StealthBrowser']:
+        """
+        起動済みのブラウザを共有し、独立したコンテキストを持つStealthBrowserを作成
+        
+        ブラウザの起動コストを払わずに並列処理用のタブ環境を増やす
+        
+        Args:
+            storage_state: 新しいコンテキストに引き継ぐストレージ状態（Cookie等）
+            
+        Returns:
+            新しいStealthBrowser（作成失敗時はNone）
+        """
+        sibling = StealthBrowser(headless=self.headless)
+        sibling.playwright = self.playwright
+        sibling.browser = self.browser
+        sibling._owns_browser = False
+        sibling._viewport = dict(self._viewport)
+        
+        try:
+            await sibling._open_context(storage_state)
+            return sibling
+        except Exception as e:
+            print(f"コンテキスト作成エラー: {e}")
+            return None
+    
+    async def open_view(self) -> 'StealthBrowser':
+        """
+        同じコンテキストに新しいタブを開き、そのタブを操作するStealthBrowserを作成
+        
+        Cookieを共有したまま別のページを並行して操作するために使う
+        
+        Returns:
+            新しいタブに紐づいたStealthBrowser（close()でタブのみ閉じる）
+        """
+        view = StealthBrowser(headless=self.headless)
+        view.playwright = self.playwright
+        view.browser = self.browser
+        view.context = self.context
+        view._owns_browser = False
+        view._parent = self
+        view._viewport = self._viewport
+        
+        view.page = await self.context.new_page()
+        view._track_page(view.page)
+        self._views.append(view)
+        return view
+    
+    async def _open_context(self, storage_state: Optional[Dict[str, Any]] = None):
+        """
+        コンテキストと最初のページを作成してステルス設定を適用
+        
+        Args:
+            storage_state: コンテキストに読み込むストレージ状態
+        """
+        width, height = self._viewport['width'], self._viewport['height']
+        
+        # コンテキスト作成（設定値を使用）
+        self.context = await self.browser.new_context(
+            viewport={'width': width, 'height': height},
+            user_agent=get_random_user_agent(),
+            locale=LOCALE,
+            timezone_id=TIMEZONE,
+            storage_state=storage_state,
+        )
+        
+        # 計測・広告と画像の読み込みを止めてページ読み込みを軽くする（フォントなどはキャッシュを効かせるためルートを掛けない）
+        await self.context.route(_BLOCKED_URL_RE, self._abort_request)
+        await self.context.route(_BLOCKED_IMAGE_RE, self._route_image)
+        
+        # ステルス設定はコンテキストに1回だけ登録（新しいタブ・別タブにも自動で適用される）
+        await self.context.add_init_script(_STEALTH_INIT_JS)
+        
+        # 新しいページを作成
+        self.page = await self.context.new_page()
+        self._track_page(self.page)
+    
+    async def _abort_request(self, route: Route):
+        """計測・広告のリクエストを止める"""
+        await route.abort()
+    
+    async def _route_image(self, route: Route):
+        """画像のリクエストを読み込むか止めるかを判定"""
+        if self._allows_image(route.request):
+            await route.continue_()
+        else:
+            await route.abort()
+    
+    def _allows_image(self, request) -> bool:
+        """画像を読み込むリクエストか（CAPTCHAの画像、またはload_images中の自分のタブの画像）"""
+        if any(pattern in request.url for pattern in ALLOWED_URL_PATTERNS):
+            return True
+        if not self.load_images:
+            return False
+        try:
+            page = request.frame.page
+        except Exception:
+            return False  # Service Workerからのリクエストなどタブに紐づかないもの
+        # open_view()の別タブは同じコンテキストでも画像を読み込まない
+        return all(page not in view.pages for view in self._views)
+    
     async def close(self):
-        """ブラウザを閉じる"""
+        """ブラウザを閉じる（spawn()で作成した場合は自分のコンテキスト、open_view()の場合は自分のタブのみ）"""
+        if self._parent is not None:
+            self._parent._views.remove(self)
+            for page in self.pages:
+                if not page.is_closed():
+                    await page.close()
+            return
         if self.context:
             await self.context.close()
+        if not self._owns_browser:
+            return
         if self.browser:
             await self.browser.close()
         if self.playwright:
@@ -124,33 +321,60 @@ class StealthBrowser:
             min_ms: 最小待機時間（ミリ秒）
             max_ms: 最大待機時間（ミリ秒）
         """
-        min_ms = min_ms or ACTION_DELAY_MIN
-        max_ms = max_ms or ACTION_DELAY_MAX
-        wait_time = random.randint(min_ms, max_ms) / 1000
-        await asyncio.sleep(wait_time)
+        low = min_ms or ACTION_DELAY_MIN
+        high = max_ms or ACTION_DELAY_MAX
+        await asyncio.sleep((low + (high - low) * self._rng.random()) / 1000)
     
     async def wait_for_load(self):
-        """ページ読み込み完了を待機"""
+        """
+        ページ読み込み完了を待機
+        
+        networkidle自体が通信の途切れ（500ms）を待つため、待機は追加しない
+        （操作の前に間を空けたい場合は呼び出し側でrandom_waitする）
+        """
         await self.page.wait_for_load_state('networkidle')
-        await self.random_wait(500, 1000)
     
-    async def human_type(self, selector: str, text: str):
+    async def human_type(self, selector: str, text: str, realistic: bool = True):
         """
         人間らしいタイピング
         
         Args:
             selector: 入力要素のセレクタ
             text: 入力するテキスト
+            realistic: Falseの場合はキー入力を再現せず値を一括で設定する（長い文章など）
         """
-        element = await self.page.wait_for_selector(selector)
+        element = self._loc(selector)
+        if not realistic:
+            await element.fill(text)
+            await self.random_wait(100, 250)
+            return
+        
         await element.click()
         await self.random_wait(200, 500)
         
-        # 1文字ずつ入力
-        for char in text:
-            await self.page.keyboard.type(char)
-            delay = random.randint(TYPING_DELAY_MIN, TYPING_DELAY_MAX)
-            await asyncio.sleep(delay / 1000)
+        # 数文字ずつ入力（文字間のディレイはPlaywright側で入れ、まとまりごとに間隔を変える）
+        i = 0
+        while i < len(text):
+            n = get_random_typing_burst(self._rng)
+            await self.page.keyboard.type(
+                text[i:i + n],
+                delay=self._rng.randint(TYPING_DELAY_MIN, TYPING_DELAY_MAX)
+            )
+            i += n
+    
+    async def fill(self, selector: str, text: str, timeout: Optional[float] = None):
+        """
+        テキストを一括入力（ログイン後のフォームなど、タイピングを見られない入力欄向け）
+        
+        Args:
+            selector: 入力要素のセレクタ
+            text: 入力するテキスト
+            timeout: 入力欄が表示されるまで待つ時間（ミリ秒、省略時はPlaywrightの既定値）
+        """
+        field = self.page.locator(selector).first
+        await field.fill(text, timeout=timeout)
+        # フォーカスを外して入力チェック（blurイベント）を発火させる
+        await field.press('Tab')
     
     async def bezier_move_to(self, x: int, y: int):
         """
@@ -160,28 +384,47 @@ class StealthBrowser:
             x: 目標X座標
             y: 目標Y座標
         """
-        # 現在のマウス位置を取得（デフォルトは画面中央付近）
-        start_x = random.randint(400, 600)
-        start_y = random.randint(300, 500)
+        # 現在のマウス位置を取得（このページで未移動なら画面中央付近）
+        if self._last_mouse is not None and self._last_mouse[0] is self.page:
+            _, start_x, start_y = self._last_mouse
+        else:
+            start_x = self._rng.randint(400, 600)
+            start_y = self._rng.randint(300, 500)
+        self._last_mouse = (self.page, x, y)
+        
+        # すでに目標の近くにいれば直接移動
+        distance = abs(x - start_x) + abs(y - start_y)
+        if distance < MOUSE_DIRECT_MOVE_DISTANCE:
+            await self.page.mouse.move(x, y)
+            return
         
         # 制御点をランダムに生成
         offset = BEZIER_CONTROL_OFFSET
-        ctrl1_x = start_x + (x - start_x) * 0.3 + random.randint(-offset, offset)
-        ctrl1_y = start_y + (y - start_y) * 0.3 + random.randint(-offset, offset)
-        ctrl2_x = start_x + (x - start_x) * 0.7 + random.randint(-offset, offset)
-        ctrl2_y = start_y + (y - start_y) * 0.7 + random.randint(-offset, offset)
-        
-        # ベジェ曲線に沿って移動
-        steps = get_random_mouse_steps()
-        for i in range(steps + 1):
-            t = i / steps
-            
-            # 3次ベジェ曲線の計算
-            px = (1-t)**3 * start_x + 3*(1-t)**2*t * ctrl1_x + 3*(1-t)*t**2 * ctrl2_x + t**3 * x
-            py = (1-t)**3 * start_y + 3*(1-t)**2*t * ctrl1_y + 3*(1-t)*t**2 * ctrl2_y + t**3 * y
-            
-            await self.page.mouse.move(px, py)
-            await asyncio.sleep(random.randint(5, 15) / 1000)
+        jitter1_x, jitter1_y, jitter2_x, jitter2_y = (
+            offset * (2 * self._rng.random() - 1) for _ in range(4)
+        )
+        ctrl1_x = start_x + (x - start_x) * 0.3 + jitter1_x
+        ctrl1_y = start_y + (y - start_y) * 0.3 + jitter1_y
+        ctrl2_x = start_x + (x - start_x) * 0.7 + jitter2_x
+        ctrl2_y = start_y + (y - start_y) * 0.7 + jitter2_y
+        
+        # 3次ベジェ曲線上の点を先にすべて計算（短い移動ほどステップ数を減らす）
+        steps = max(MOUSE_MOVE_STEPS_SHORT, min(get_random_mouse_steps(self._rng), int(distance / MOUSE_PIXELS_PER_STEP)))
+        points = [
+            (b0 * start_x + b1 * ctrl1_x + b2 * ctrl2_x + b3 * x,
+             b0 * start_y + b1 * ctrl1_y + b2 * ctrl2_y + b3 * y)
+            for b0, b1, b2, b3 in _bernstein_table(steps)
+        ]
+        
+        # 各点の間の待機時間（5〜15ms）もまとめて生成
+        delays = [ms / 1000 for ms in self._rng.choices(_MOUSE_MOVE_DELAYS_MS, k=len(points))]
+        
+        # ベジェ曲線に沿って移動（移動の応答を待つ間に次の点までの待機を進める）
+        # 移動は順番に送る必要があるため、同時に送るのは常に1つだけにする
+        for (px, py), delay in zip(points, delays):
+            move = asyncio.create_task(self.page.mouse.move(px, py))
+            await asyncio.sleep(delay)
+            await move
     
     async def human_click(self, selector: str, wait_after: bool = True):
         """
@@ -191,14 +434,15 @@ class StealthBrowser:
             selector: クリック要素のセレクタ
             wait_after: クリック後に待機するか
         """
-        element = await self.page.wait_for_selector(selector, state='visible')
+        element = self._loc(selector)
+        await element.wait_for(state='visible')
         
         # 要素の位置を取得
         box = await element.bounding_box()
         if box:
             # 要素の中心にランダムなオフセットを加えた位置をクリック
-            x = box['x'] + box['width'] / 2 + random.randint(-5, 5)
-            y = box['y'] + box['height'] / 2 + random.randint(-5, 5)
+            x = box['x'] + box['width'] / 2 + self._rng.randint(-5, 5)
+            y = box['y'] + box['height'] / 2 + self._rng.randint(-5, 5)
             
             # ベジェ曲線で移動
             await self.bezier_move_to(int(x), int(y))
@@ -209,6 +453,28 @@ class StealthBrowser:
         if wait_after:
             await self.random_wait()
     
+    async def human_click_new_tab(self, selector: str) -> Page:
+        """
+        新しいタブを開く要素を人間らしくクリックし、開いたタブに切り替え
+        
+        クリック前から新しいページを待ち受けるため、タブが開くまでのポーリングが不要
+        
+        Args:
+            selector: クリック要素のセレクタ
+            
+        Returns:
+            新しいページ
+        """
+        async with self.context.expect_page() as page_info:
+            await self.human_click(selector, wait_after=False)
+        new_page = await page_info.value
+        await new_page.wait_for_load_state('domcontentloaded')
+        
+        self.page = new_page
+        self._track_page(new_page)
+        
+        return new_page
+    
     async def select_option(self, selector: str, value: str):
         """
         プルダウンから選択
@@ -217,21 +483,25 @@ class StealthBrowser:
             selector: セレクト要素のセレクタ
             value: 選択する値
         """
-        await self.page.wait_for_selector(selector)
+        element = self._loc(selector)
+        await element.wait_for()
         await self.random_wait(300, 600)
-        await self.page.select_option(selector, value=value)
+        await element.select_option(value=value)
         await self.random_wait()
     
-    async def navigate(self, url: str):
+    async def navigate(self, url: str, wait_until: str = 'domcontentloaded'):
         """
         ページに移動
         
+        以降の操作は要素の表示を待つため、通常はDOMの構築までで十分
+        （リダイレクトの完了などを確認する場合のみ'networkidle'を指定する）
+        
         Args:
             url: 移動先URL
+            wait_until: 移動完了とみなすタイミング（Page.gotoのwait_until）
         """
-        await self.page.goto(url)
-        await self.wait_for_load()
-        await self.random_wait()
+        await self.page.goto(url, wait_until=wait_until)
+        await self.random_wait(300, 800)
     
     async def switch_to_new_tab(self) -> Optional[Page]:
         """
@@ -240,42 +510,46 @@ class StealthBrowser:
         Returns:
             新しいページ（なければNone）
         """
-        # タブが開くのを少し待つ
-        for _ in range(10):  # 最大5秒待機
-            await asyncio.sleep(0.5)
-            pages = self.context.pages
-            if len(pages) > 0:
-                latest_page = pages[-1]
-                # 現在のページと異なる、かつまだ管理リストにない（または最新のページ）場合に切り替え
-                if latest_page != self.page:
-                    await latest_page.wait_for_load_state()
-                    self.page = latest_page
-                    
-                    # 管理リストを更新
-                    self.pages = pages
-                    
-                    # ステルスモードを適用
-                    stealth = Stealth()
-                    await stealth.apply_stealth_async(self.page)
-                    
-                    return self.page
-        
-        return None
+        # open_view()で開いたタブは切り替え対象にしない
+        view_pages = {p for view in self._views for p in view.pages}
+        pages = [p for p in self.context.pages if p not in view_pages]
+        
+        # 最新のタブが現在のページなら、新しいタブが開くのを待つ（開いた時点ですぐ戻る、最大5秒）
+        if not pages or pages[-1] == self.page:
+            try:
+                await self.context.wait_for_event('page', timeout=5000)
+            except PlaywrightTimeoutError:
+                return None
+            pages = [p for p in self.context.pages if p not in view_pages]
+        
+        latest_page = pages[-1]
+        await latest_page.wait_for_load_state()
+        self.page = latest_page
+        
+        # 管理リストを更新
+        self._pages = {id(p): p for p in pages}
+        
+        return self.page
     
     async def close_current_tab(self):
         """現在のタブを閉じる"""
-        if len(self.pages) > 1:
+        if len(self._pages) > 1:
             current_page = self.page
-            self.pages.remove(current_page)
+            self._pages.pop(id(current_page), None)
             await current_page.close()
             
             # 前のタブに戻る
-            self.page = self.pages[-1]
+            self.page = next(reversed(self._pages.values()))
             await self.random_wait()
     
+    @property
+    def url(self) -> str:
+        """現在のURL（Playwrightが保持している値のため、ブラウザとの通信は発生しない）"""
+        return self.page.url
+    
     async def get_current_url(self) -> str:
         """現在のURLを取得"""
-        return self.page.url
+        return self.url
     
     async def get_text_content(self, selector: str) -> str:
         """
@@ -287,7 +561,8 @@ class StealthBrowser:
         Returns:
             テキスト内容
         """
-        element = await self.page.wait_for_selector(selector)
+        element = self._loc(selector)
+        await element.wait_for()
         return await element.text_content() or ""
     
     async def get_input_value(self, selector: str) -> str:
@@ -300,7 +575,8 @@ class StealthBrowser:
         Returns:
             入力値
         """
-        element = await self.page.wait_for_selector(selector)
+        element = self._loc(selector)
+        await element.wait_for()
         return await element.input_value() or ""
     
     async def check_element_exists(self, selector: str, timeout: int = 5000) -> bool:
@@ -314,8 +590,12 @@ class StealthBrowser:
         Returns:
             存在するかどうか
         """
+        element = self._loc(selector)
         try:
-            await self.page.wait_for_selector(selector, timeout=timeout)
+            # すでに表示されていれば待機の仕組みを使わずに返す
+            if await element.is_visible():
+                return True
+            await element.wait_for(timeout=timeout)
             return True
         except Exception:
             return False
@@ -329,7 +609,8 @@ class StealthBrowser:
             target_x: 移動先X座標
             target_y: 移動先Y座標
         """
-        element = await self.page.wait_for_selector(selector)
+        element = self._loc(selector)
+        await element.wait_for()
         box = await element.bounding_box()
         
         if box:
@@ -341,16 +622,18 @@ class StealthBrowser:
             await self.page.mouse.down()
             await self.random_wait(100, 200)
             
-            # 段階的に移動
-            steps = 10
-            for i in range(1, steps + 1):
-                px = start_x + (target_x - start_x) * i / steps
-                py = start_y + (target_y - start_y) * i / steps
-                await self.page.mouse.move(px, py)
-                await asyncio.sleep(random.randint(10, 30) / 1000)
+            # 2〜3区間に分けて移動（区間内の段階的な移動はPlaywright側でstepsに分けて行う）
+            segments = self._rng.randint(2, 3)
+            for i in range(1, segments + 1):
+                px = start_x + (target_x - start_x) * i / segments
+                py = start_y + (target_y - start_y) * i / segments
+                move = asyncio.create_task(self.page.mouse.move(px, py, steps=self._rng.randint(5, 8)))
+                await asyncio.sleep(self._rng.randint(10, 30) / 1000)
+                await move
             
             await self.random_wait(100, 200)
             await self.page.mouse.up()
+            self._last_mouse = (self.page, target_x, target_y)
     
     async def close_other_tabs(self):
         """
@@ -359,19 +642,14 @@ class StealthBrowser:
         if not self.context:
             return
             
-        pages = self.context.pages
         current_page = self.page
+        others = [p for p in self.context.pages if p != current_page and not p.is_closed()]
         
-        for p in pages:
-            if p != current_page and not p.is_closed():
-                try:
-                    await p.close()
-                    await asyncio.sleep(0.5)
-                except Exception:
-                    pass
+        # まとめて閉じる（閉じる操作はサイト側から見えないため間隔は空けない）
+        await asyncio.gather(*(p.close() for p in others), return_exceptions=True)
         
         # 管理リストを更新（閉じられていないページのみ残す）
-        self.pages = [p for p in self.context.pages if not p.is_closed()]
+        self._pages = {id(p): p for p in self.context.pages if not p.is_closed()}
 
     async def upload_file(self, selector: str, file_path: str):
         """
@@ -382,6 +660,63 @@ class StealthBrowser:
             file_path: アップロードするファイルのパス
         """
         # ファイル選択ダイアログをバイパスして直接ファイルを設定
-        file_input = await self.page.wait_for_selector(selector)
-        await file_input.set_input_files(file_path)
+        await self._loc(selector).set_input_files(file_path)
         await self.random_wait()
+
+
+class StealthBrowserPool:
+    """
+    1つのブラウザを共有し、独立したコンテキストを持つStealthBrowserを貸し出すプール
+    
+    ブラウザの起動は1回だけ行い、各処理にはコンテキスト（spawn()）を割り当てる
+    """
+    
+    def __init__(self, headless: bool = False, max_contexts: int = 1):
+        """
+        Args:
+            headless: ヘッドレスモードで実行するか
+            max_contexts: 同時に開く追加コンテキストの最大数（primaryのコンテキストは含まない）
+        """
+        self.primary = StealthBrowser(headless=headless)  # ブラウザを起動・所有するインスタンス
+        self._slots = asyncio.Semaphore(max_contexts)
+    
+    async def launch(self, storage_state: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        共有ブラウザを起動
+        
+        Args:
+            storage_state: primaryのコンテキストに読み込むストレージ状態
+        
+        Returns:
+            起動成功かどうか
+        """
+        return await self.primary.launch(storage_state)
+    
+    async def open(self, storage_state: Optional[Dict[str, Any]] = None) -> Optional[StealthBrowser]:
+        """
+        新しいコンテキストのStealthBrowserを作成（max_contexts個開いている場合は空くまで待機）
+        
+        使い終わったら release() で閉じる
+        
+        Args:
+            storage_state: 新しいコンテキストに引き継ぐストレージ状態（Cookie等）
+            
+        Returns:
+            新しいStealthBrowser（作成失敗時はNone）
+        """
+        await self._slots.acquire()
+        browser = await self.primary.spawn(storage_state)
+        if browser is None:
+            self._slots.release()
+        return browser
+    
+    async def release(self, browser: StealthBrowser):
+        """open() で作成したStealthBrowserのコンテキストを閉じる"""
+        try:
+            await browser.close()
+        finally:
+            self._slots.release()
+    
+    async def close(self):
+        """共有ブラウザを閉じる"""
+        await self.primary.close()
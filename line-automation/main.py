@@ -4,87 +4,47 @@ LINE自動化フロー - PySide6 フロントエンド
 """
 
 import sys
-import threading
+import functools
+import collections
 import asyncio
 from typing import Optional, List
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QComboBox, QPushButton, QTabWidget,
-    QScrollArea, QFrame, QSpacerItem, QSizePolicy, QMessageBox, QDialog
+    QScrollArea, QFrame, QSpacerItem, QSizePolicy, QMessageBox, QDialog,
+    QCheckBox, QPlainTextEdit, QFileDialog, QListView
 )
-from PySide6.QtCore import Qt, Signal, QObject, QPropertyAnimation, Property, QEasingCurve
-from PySide6.QtGui import QFont, QPainter, QColor
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QStringListModel, QTimer
+from PySide6.QtGui import QFont
 
+from config.settings import ASSETS_DIR
 from core.sheets_client import SheetsClient, get_column_options
 
 
+@functools.lru_cache(maxsize=None)
+def _ui_font(point_size: int, bold: bool = False) -> QFont:
+    """
+    UIで使うフォントを取得（同じ指定なら同じQFontを使い回す）
+    
+    QFontはQApplication生成後に作る必要があるため、モジュール定数ではなく初回呼び出し時に作成する
+    """
+    return QFont("", point_size, QFont.Bold if bold else QFont.Normal)
+
+
 class StyledComboBox(QComboBox):
-    """矢印付きカスタムコンボボックス"""
+    """矢印付きカスタムコンボボックス（矢印は DARK_STYLE の down-arrow 画像）"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
         
         # リストビューを作成してチェックマークを無効化
-        from PySide6.QtWidgets import QListView
         list_view = QListView()
-        list_view.setStyleSheet("""
-            QListView {
-                background-color: #1a1a1a;
-                border: 1px solid #333333;
-                color: #ffffff;
-                outline: none;
-                padding: 4px;
-            }
-            QListView::item {
-                padding: 8px 16px;
-                background-color: #1a1a1a;
-                color: #ffffff;
-                border: none;
-            }
-            QListView::item:hover {
-                background-color: #2a2a2a;
-            }
-            QListView::item:selected {
-                background-color: #00d4aa;
-                color: #0f0f0f;
-            }
-        """)
+        list_view.setObjectName("comboList")
+        list_view.setUniformItemSizes(True)  # 行ごとのサイズ計算を省略
         self.setView(list_view)
         
-        self.setStyleSheet("""
-            QComboBox {
-                background-color: #1a1a1a;
-                border: 1px solid #333333;
-                border-radius: 8px;
-                padding: 12px 40px 12px 16px;
-                color: #ffffff;
-                font-size: 14px;
-                min-height: 20px;
-            }
-            QComboBox:focus {
-                border-color: #00d4aa;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-            }
-        """)
-    
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        # 矢印を描画
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(QColor("#a0a0a0"))
-        painter.setFont(QFont("Arial", 12))
-        
-        # 右側に▼を描画
-        rect = self.rect()
-        arrow_rect = rect.adjusted(rect.width() - 35, 0, -10, 0)
-        painter.drawText(arrow_rect, Qt.AlignVCenter | Qt.AlignCenter, "▼")
+        # スタイルは DARK_STYLE の QComboBox#styledCombo で定義
+        self.setObjectName("styledCombo")
 
 
 class CaptchaDialog(QDialog):
@@ -96,12 +56,8 @@ class CaptchaDialog(QDialog):
         self.setFixedSize(450, 280)
         self.setModal(True)
         
-        # ダークテーマ
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1a1a1a;
-            }
-        """)
+        # ダークテーマ（DARK_STYLE の QDialog#captchaDialog）
+        self.setObjectName("captchaDialog")
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(32, 32, 32, 32)
@@ -109,13 +65,13 @@ class CaptchaDialog(QDialog):
         
         # アイコン
         icon_label = QLabel("⚠️")
-        icon_label.setStyleSheet("font-size: 48px; color: #ffffff;")
+        icon_label.setObjectName("captchaIcon")
         icon_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon_label)
         
         # メッセージ
         message_label = QLabel("画像認証（CAPTCHA）が検出されました。\nブラウザで認証を完了してから、\n下のボタンをクリックしてください。")
-        message_label.setStyleSheet("color: #ffffff; font-size: 14px;")
+        message_label.setObjectName("captchaMessage")
         message_label.setAlignment(Qt.AlignCenter)
         message_label.setWordWrap(True)
         layout.addWidget(message_label)
@@ -125,88 +81,11 @@ class CaptchaDialog(QDialog):
         # 完了ボタン
         complete_button = QPushButton("認証完了")
         complete_button.setFixedSize(160, 48)
-        complete_button.setStyleSheet("""
-            QPushButton {
-                background-color: #00d4aa;
-                color: #0f0f0f;
-                font-size: 16px;
-                font-weight: bold;
-                border: none;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: #00f5c4;
-            }
-        """)
+        complete_button.setObjectName("captchaCompleteButton")
         complete_button.clicked.connect(self.accept)
         layout.addWidget(complete_button, alignment=Qt.AlignCenter)
 
 
-class ToggleSwitch(QWidget):
-    """カスタムトグルスイッチウィジェット"""
-    toggled = Signal(bool)
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._checked = False
-        self._thumb_position = 4
-        self.setFixedSize(52, 28)
-        self.setCursor(Qt.PointingHandCursor)
-        
-        # アニメーション
-        self._animation = QPropertyAnimation(self, b"thumb_position", self)
-        self._animation.setDuration(200)
-        self._animation.setEasingCurve(QEasingCurve.InOutCubic)
-    
-    def get_thumb_position(self):
-        return self._thumb_position
-    
-    def set_thumb_position(self, pos):
-        self._thumb_position = pos
-        self.update()
-    
-    thumb_position = Property(float, get_thumb_position, set_thumb_position)
-    
-    def isChecked(self):
-        return self._checked
-    
-    def setChecked(self, checked):
-        if self._checked != checked:
-            self._checked = checked
-            self._animate()
-            self.toggled.emit(checked)
-    
-    def _animate(self):
-        self._animation.stop()
-        if self._checked:
-            self._animation.setStartValue(self._thumb_position)
-            self._animation.setEndValue(28)
-        else:
-            self._animation.setStartValue(self._thumb_position)
-            self._animation.setEndValue(4)
-        self._animation.start()
-    
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.setChecked(not self._checked)
-    
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 背景
-        if self._checked:
-            bg_color = QColor("#00d4aa")
-        else:
-            bg_color = QColor("#3a3a3a")
-        
-        painter.setBrush(bg_color)
-        painter.setPen(Qt.NoPen)
-        painter.drawRoundedRect(0, 0, 52, 28, 14, 14)
-        
-        # サム（つまみ）
-        painter.setBrush(QColor("#ffffff"))
-        painter.drawEllipse(int(self._thumb_position), 4, 20, 20)
 from core.settings_manager import SettingsManager, LineSettings, AppSettings
 
 
@@ -313,6 +192,44 @@ QComboBox::down-arrow {
     height: 12px;
 }
 
+QComboBox#styledCombo {
+    padding: 12px 40px 12px 16px;
+}
+
+QComboBox#styledCombo::drop-down {
+    width: 30px;
+}
+
+QComboBox#styledCombo::down-arrow {
+    image: url("{ASSETS_DIR}/combo_arrow.svg");
+    width: 12px;
+    height: 12px;
+}
+
+QListView#comboList {
+    background-color: #1a1a1a;
+    border: 1px solid #333333;
+    color: #ffffff;
+    outline: none;
+    padding: 4px;
+}
+
+QListView#comboList::item {
+    padding: 8px 16px;
+    background-color: #1a1a1a;
+    color: #ffffff;
+    border: none;
+}
+
+QListView#comboList::item:hover {
+    background-color: #2a2a2a;
+}
+
+QListView#comboList::item:selected {
+    background-color: #00d4aa;
+    color: #0f0f0f;
+}
+
 QComboBox QAbstractItemView {
     background-color: #1a1a1a;
     border: 1px solid #333333;
@@ -329,54 +246,81 @@ QPushButton {
     font-weight: bold;
 }
 
+QPushButton#runButton, QPushButton#pauseButton, QPushButton#saveButton {
+    font-size: 15px;
+    font-weight: bold;
+    border-radius: 8px;
+}
+
 QPushButton#runButton {
     background-color: #00d4aa;
     color: #0f0f0f;
-    font-size: 15px;
-    font-weight: bold;
-    min-width: 100px;
-    border: 2px solid #00d4aa;
+    border: none;
 }
 
 QPushButton#runButton:hover {
     background-color: #00f5c4;
-    border-color: #00f5c4;
 }
 
-QPushButton#runButton:disabled {
-    background-color: #1a1a1a;
+QPushButton#runButton:disabled, QPushButton#pauseButton:disabled {
+    background-color: #333333;
     color: #666666;
-    border-color: #333333;
 }
 
 QPushButton#pauseButton {
     background-color: #ff6b35;
     color: #ffffff;
-    font-size: 15px;
-    font-weight: bold;
-    min-width: 100px;
-    border: 2px solid #ff6b35;
+    border: none;
 }
 
 QPushButton#pauseButton:hover {
     background-color: #ff8c5a;
-    border-color: #ff8c5a;
-}
-
-QPushButton#pauseButton:disabled {
-    background-color: #1a1a1a;
-    color: #666666;
-    border-color: #333333;
 }
 
 QPushButton#saveButton {
     background-color: #242424;
     color: #ffffff;
-    border: 1px solid #333333;
+    border: 1px solid #444444;
 }
 
 QPushButton#saveButton:hover {
     background-color: #333333;
+    border-color: #555555;
+}
+
+QPushButton#iconPathButton {
+    background-color: #242424;
+    color: #ffffff;
+    font-size: 13px;
+    border: 1px solid #444444;
+    border-radius: 6px;
+    padding: 8px;
+}
+
+QPushButton#iconPathButton:hover {
+    background-color: #333333;
+}
+
+QPushButton#captchaCompleteButton {
+    background-color: #00d4aa;
+    color: #0f0f0f;
+    font-size: 16px;
+    font-weight: bold;
+    border: none;
+    border-radius: 8px;
+}
+
+QPushButton#captchaCompleteButton:hover {
+    background-color: #00f5c4;
+}
+
+QPlainTextEdit#logView {
+    background-color: #1a1a1a;
+    border: 1px solid #333333;
+    border-radius: 8px;
+    padding: 8px;
+    color: #a0a0a0;
+    font-size: 12px;
 }
 
 QFrame#headlessFrame {
@@ -385,6 +329,53 @@ QFrame#headlessFrame {
     border-radius: 8px;
 }
 
+QFrame#accentBar {
+    background-color: #00d4aa;
+    border-radius: 2px;
+}
+
+QLabel#sectionTitle {
+    color: #ffffff;
+}
+
+QLabel#requiredMark {
+    color: #ff4757;
+    font-size: 14px;
+}
+
+QLabel#fieldLabel {
+    color: #a0a0a0;
+    font-size: 14px;
+}
+
+QLabel#frameLabel {
+    color: #ffffff;
+    font-size: 14px;
+}
+
+QLabel#subLabel {
+    color: #a0a0a0;
+    font-size: 12px;
+}
+
+QLabel#prolineTitle {
+    color: #a0a0a0;
+}
+
+QDialog#captchaDialog {
+    background-color: #1a1a1a;
+}
+
+QLabel#captchaIcon {
+    font-size: 48px;
+    color: #ffffff;
+}
+
+QLabel#captchaMessage {
+    color: #ffffff;
+    font-size: 14px;
+}
+
 QCheckBox {
     color: #ffffff;
     font-size: 14px;
@@ -401,7 +392,32 @@ QCheckBox::indicator {
 QCheckBox::indicator:checked {
     background-color: #00d4aa;
 }
-"""
+
+QCheckBox#toggleSwitch::indicator {
+    width: 52px;
+    height: 28px;
+    border-radius: 14px;
+    background-color: transparent;
+    image: url("{ASSETS_DIR}/toggle_off.svg");
+}
+
+QCheckBox#toggleSwitch::indicator:checked {
+    image: url("{ASSETS_DIR}/toggle_on.svg");
+}
+""".replace("{ASSETS_DIR}", ASSETS_DIR.as_posix())
+
+
+class FunctionRunnable(QRunnable):
+    """任意の関数をQThreadPoolで実行するためのラッパー"""
+    
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+    
+    def run(self):
+        self._fn(*self._args, **self._kwargs)
 
 
 class WorkerSignals(QObject):
@@ -411,11 +427,17 @@ class WorkerSignals(QObject):
     automation_finished = Signal()  # 自動化完了シグナル
     captcha_required = Signal()  # CAPTCHA検知シグナル
     captcha_resolved = Signal()  # CAPTCHA解決シグナル
+    log_message = Signal(str)  # ステータスログ
 
 
 class LineAutomationApp(QMainWindow):
     """LINE自動化アプリのメインウィンドウ"""
     
+    LOG_MAX_LINES = 1000  # ログ表示に残す最大行数
+    LOG_FLUSH_INTERVAL_MS = 100  # ログをまとめて表示する間隔
+    PROGRESS_POLL_INTERVAL_MS = 100  # 進捗キューを確認する間隔
+    CLOSE_WAIT_TIMEOUT_MS = 10000  # 終了時に自動化の停止を待つ最大時間
+    
     def __init__(self):
         super().__init__()
         
@@ -427,9 +449,34 @@ class LineAutomationApp(QMainWindow):
         self.worker_signals.sheet_names_loaded.connect(self._on_sheet_names_loaded)
         self.worker_signals.automation_finished.connect(self._finish_automation)
         self.worker_signals.captcha_required.connect(self._on_captcha_required)
-        
-        # CAPTCHA待機用（スレッド間通信のためthreading.Eventを使用）
-        self._captcha_event: Optional[threading.Event] = None
+        self.worker_signals.captcha_resolved.connect(self._on_captcha_resolved)
+        self.worker_signals.log_message.connect(self._append_log, Qt.QueuedConnection)
+        
+        # ログはバッファに溜めて一定間隔でまとめて表示する
+        self._log_buffer: List[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        
+        # 進捗は自動化スレッドがキューに積み、メインスレッドのタイマーでまとめて反映する
+        # （書き込みは自動化スレッドのみ、読み出しはメインスレッドのみなのでロック不要）
+        self._progress_queue: collections.deque = collections.deque()
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(self.PROGRESS_POLL_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._drain_progress)
+        
+        # 自動化用のイベントループとCAPTCHA待機用のasyncio.Event（初回実行時に作成し、以降の実行で再利用）
+        self._captcha_event: Optional[asyncio.Event] = None
+        self._captcha_lock: Optional[asyncio.Lock] = None  # 並列のコンテキストのCAPTCHA通知を1件ずつにする
+        self._captcha_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # バックグラウンド処理用のスレッドプール（シート名取得など短い処理）
+        self._pool = QThreadPool.globalInstance()
+        # 自動化専用のスレッドプール（長時間の処理で短い処理のスレッドを埋めないよう分ける）
+        self._automation_pool = QThreadPool(self)
+        self._automation_pool.setMaxThreadCount(1)
+        self._sheet_req_id = 0  # 最新のシート名取得リクエストID
         
         # UI参照
         self.email_input: Optional[QLineEdit] = None
@@ -437,11 +484,14 @@ class LineAutomationApp(QMainWindow):
         self.sheet_url_input: Optional[QLineEdit] = None
         self.sheet_name_combo: Optional[QComboBox] = None
         self.column_combos: dict = {}
+        self._combo_text_index: dict = {}  # 列キー -> {選択肢: インデックス}
         self.icon_path_input = None
         self.biz_manager_toggle = None
         self.biz_manager_input = None
         self.biz_manager_input_container = None
         self.headless_toggle = None
+        self.log_view: Optional[QPlainTextEdit] = None
+        self.progress_label: Optional[QLabel] = None
         
         self.run_button: Optional[QPushButton] = None
         self.pause_button: Optional[QPushButton] = None
@@ -451,18 +501,61 @@ class LineAutomationApp(QMainWindow):
         self.is_running = False
         self.is_paused = False
         self.automation_runner = None
-        self.automation_thread = None
+        self.automation_worker: Optional[FunctionRunnable] = None
         self._pending_sheet_name = None  # 復元待ちのシート名
+        self._sheet_index: dict = {}  # シート名 -> コンボボックスのインデックス
+        
+        # 通知用のメッセージボックス（毎回作り直さず使い回す）
+        self._message_box: Optional[QMessageBox] = None
         
         self.setup_ui()
+        self._build_field_maps()
         self.load_settings()
     
+    def _show_message(self, icon: QMessageBox.Icon, title: str, text: str):
+        """使い回しのメッセージボックスで通知を表示"""
+        if self._message_box is None:
+            self._message_box = QMessageBox(self)
+            self._message_box.setStandardButtons(QMessageBox.Ok)
+        if self._message_box.isVisible():
+            # 表示中の通知がある場合は重ねて別のボックスを出す
+            QMessageBox(icon, title, text, QMessageBox.Ok, self).exec()
+            return
+        self._message_box.setIcon(icon)
+        self._message_box.setWindowTitle(title)
+        self._message_box.setText(text)
+        self._message_box.exec()
+    
+    def _build_field_maps(self):
+        """LineSettingsのフィールド名 -> 入力ウィジェットの対応表を作成"""
+        self._text_fields = {
+            'email': self.email_input,
+            'password': self.password_input,
+            'sheet_url': self.sheet_url_input,
+            'icon_save_path': self.icon_path_input,
+            'biz_manager_name': self.biz_manager_input,
+        }
+        self._combo_fields = {
+            'sheet_name': self.sheet_name_combo,
+            **{f"col_{key}": combo for key, combo in self.column_combos.items()},
+        }
+        self._toggle_fields = {
+            'biz_manager_enabled': self.biz_manager_toggle,
+            'headless_mode': self.headless_toggle,
+        }
+    
+    def _collect_field_values(self) -> dict:
+        """全入力ウィジェットの値を1回ずつ読み取る"""
+        values = {key: w.text() for key, w in self._text_fields.items()}
+        values.update((key, w.currentText()) for key, w in self._combo_fields.items())
+        values.update((key, w.isChecked()) for key, w in self._toggle_fields.items())
+        return values
+    
     def setup_ui(self):
         """UIをセットアップ"""
         self.setWindowTitle("LINE自動化フロー")
         self.setMinimumSize(600, 700)
         self.resize(600, 900)
-        self.setStyleSheet(DARK_STYLE)
         
         # 中央ウィジェット
         central_widget = QWidget()
@@ -474,16 +567,34 @@ class LineAutomationApp(QMainWindow):
         
         # タブウィジェット
         tab_widget = QTabWidget()
-        tab_widget.setFont(QFont("", 14))
+        tab_widget.setFont(_ui_font(14))
         main_layout.addWidget(tab_widget)
         
         # 公式LINEタブ
         line_tab = self.create_line_tab()
         tab_widget.addTab(line_tab, "公式LINE")
         
-        # プロラインタブ
-        proline_tab = self.create_proline_tab()
-        tab_widget.addTab(proline_tab, "プロライン")
+        # プロラインタブ（初めて表示されたときに作成）
+        self._tab_widget = tab_widget
+        self._proline_built = False
+        tab_widget.addTab(QWidget(), "プロライン")
+        tab_widget.currentChanged.connect(self._maybe_build_proline)
+    
+    def _maybe_build_proline(self, index: int):
+        """プロラインタブが初めて選択されたときに中身を作成"""
+        if self._proline_built or self._tab_widget.tabText(index) != "プロライン":
+            return
+        self._proline_built = True
+        
+        placeholder = self._tab_widget.widget(index)
+        self._tab_widget.blockSignals(True)
+        try:
+            self._tab_widget.removeTab(index)
+            self._tab_widget.insertTab(index, self.create_proline_tab(), "プロライン")
+            self._tab_widget.setCurrentIndex(index)
+        finally:
+            self._tab_widget.blockSignals(False)
+        placeholder.deleteLater()
     
     def create_section_header(self, title: str) -> QWidget:
         """セクションヘッダーを作成"""
@@ -495,18 +606,25 @@ class LineAutomationApp(QMainWindow):
         # アクセントバー
         accent = QFrame()
         accent.setFixedSize(4, 20)
-        accent.setStyleSheet("background-color: #00d4aa; border-radius: 2px;")
+        accent.setObjectName("accentBar")
         layout.addWidget(accent)
         
         # タイトル
         label = QLabel(title)
-        label.setFont(QFont("", 16, QFont.Bold))
-        label.setStyleSheet("color: #ffffff;")
+        label.setFont(_ui_font(16, bold=True))
+        label.setObjectName("sectionTitle")
         layout.addWidget(label)
         
         layout.addStretch()
         return frame
     
+    def create_toggle_switch(self) -> QCheckBox:
+        """トグルスイッチを作成（描画は DARK_STYLE の QCheckBox#toggleSwitch）"""
+        toggle = QCheckBox()
+        toggle.setObjectName("toggleSwitch")
+        toggle.setCursor(Qt.PointingHandCursor)
+        return toggle
+    
     def create_labeled_input(self, label_text: str, required: bool = False, 
                              password: bool = False, placeholder: str = "") -> tuple:
         """ラベル付き入力フィールドを作成"""
@@ -521,11 +639,11 @@ class LineAutomationApp(QMainWindow):
         
         if required:
             req = QLabel("※")
-            req.setStyleSheet("color: #ff4757; font-size: 14px;")
+            req.setObjectName("requiredMark")
             label_layout.addWidget(req)
         
         label = QLabel(label_text)
-        label.setStyleSheet("color: #a0a0a0; font-size: 14px;")
+        label.setObjectName("fieldLabel")
         label_layout.addWidget(label)
         label_layout.addStretch()
         
@@ -542,8 +660,13 @@ class LineAutomationApp(QMainWindow):
         return container, input_field
     
     def create_labeled_combo(self, label_text: str, options: List[str], 
-                             required: bool = False) -> tuple:
-        """ラベル付きコンボボックスを作成"""
+                             required: bool = False,
+                             model: Optional[QStringListModel] = None) -> tuple:
+        """
+        ラベル付きコンボボックスを作成
+        
+        modelを渡した場合はoptionsの代わりにそのモデルを共有する
+        """
         container = QWidget()
         layout = QVBoxLayout(container)
         layout.setContentsMargins(0, 8, 0, 4)
@@ -555,11 +678,11 @@ class LineAutomationApp(QMainWindow):
         
         if required:
             req = QLabel("※")
-            req.setStyleSheet("color: #ff4757; font-size: 14px;")
+            req.setObjectName("requiredMark")
             label_layout.addWidget(req)
         
         label = QLabel(label_text)
-        label.setStyleSheet("color: #a0a0a0; font-size: 14px;")
+        label.setObjectName("fieldLabel")
         label_layout.addWidget(label)
         label_layout.addStretch()
         
@@ -567,7 +690,10 @@ class LineAutomationApp(QMainWindow):
         
         # コンボボックス（カスタム）
         combo = StyledComboBox()
-        combo.addItems(options)
+        if model is not None:
+            combo.setModel(model)
+        else:
+            combo.addItems(options)
         layout.addWidget(combo)
         
         return container, combo
@@ -581,12 +707,15 @@ class LineAutomationApp(QMainWindow):
         
         # コンテンツウィジェット
         content = QWidget()
-        content.setStyleSheet("background-color: #0f0f0f;")
+        content.setObjectName("tabContent")
         layout = QVBoxLayout(content)
         layout.setContentsMargins(4, 0, 4, 0)
         layout.setSpacing(0)
         
+        # 列の選択肢は1つのモデルを全コンボボックスで共有する
         column_options = get_column_options()
+        shared_model = QStringListModel(column_options, self)
+        column_option_index = {text: i for i, text in enumerate(column_options)}
         
         # ===== ログイン情報 =====
         layout.addWidget(self.create_section_header("ログイン情報"))
@@ -632,8 +761,11 @@ class LineAutomationApp(QMainWindow):
         ]
         
         for key, label, required in column_configs:
-            container, combo = self.create_labeled_combo(label, column_options, required)
+            container, combo = self.create_labeled_combo(
+                label, column_options, required, model=shared_model
+            )
             self.column_combos[key] = combo
+            self._combo_text_index[key] = column_option_index
             layout.addWidget(container)
         
         # ===== その他 =====
@@ -647,7 +779,7 @@ class LineAutomationApp(QMainWindow):
         icon_path_layout.setSpacing(8)
         
         icon_path_label = QLabel("アイコン画像の保存先")
-        icon_path_label.setStyleSheet("color: #ffffff; font-size: 14px;")
+        icon_path_label.setObjectName("frameLabel")
         icon_path_layout.addWidget(icon_path_label)
         
         icon_path_row = QHBoxLayout()
@@ -660,19 +792,7 @@ class LineAutomationApp(QMainWindow):
         
         icon_path_button = QPushButton("選択")
         icon_path_button.setFixedWidth(80)
-        icon_path_button.setStyleSheet("""
-            QPushButton {
-                background-color: #242424;
-                color: #ffffff;
-                font-size: 13px;
-                border: 1px solid #444444;
-                border-radius: 6px;
-                padding: 8px;
-            }
-            QPushButton:hover {
-                background-color: #333333;
-            }
-        """)
+        icon_path_button.setObjectName("iconPathButton")
         icon_path_button.clicked.connect(self.on_select_icon_path)
         icon_path_row.addWidget(icon_path_button)
         
@@ -692,11 +812,11 @@ class LineAutomationApp(QMainWindow):
         
         biz_toggle_row = QHBoxLayout()
         biz_label = QLabel("ビジネスマネージャーの組織")
-        biz_label.setStyleSheet("color: #ffffff; font-size: 14px;")
+        biz_label.setObjectName("frameLabel")
         biz_toggle_row.addWidget(biz_label)
         biz_toggle_row.addStretch()
         
-        self.biz_manager_toggle = ToggleSwitch()
+        self.biz_manager_toggle = self.create_toggle_switch()
         self.biz_manager_toggle.toggled.connect(self.on_biz_manager_toggle)
         biz_toggle_row.addWidget(self.biz_manager_toggle)
         biz_manager_layout.addLayout(biz_toggle_row)
@@ -707,7 +827,7 @@ class LineAutomationApp(QMainWindow):
         biz_input_layout.setSpacing(4)
         
         biz_input_label = QLabel("組織名を入力")
-        biz_input_label.setStyleSheet("color: #a0a0a0; font-size: 12px;")
+        biz_input_label.setObjectName("subLabel")
         biz_input_layout.addWidget(biz_input_label)
         
         self.biz_manager_input = QLineEdit()
@@ -730,17 +850,31 @@ class LineAutomationApp(QMainWindow):
         headless_layout.setContentsMargins(16, 16, 16, 16)
         
         headless_label = QLabel("ヘッドレスモード")
-        headless_label.setStyleSheet("color: #ffffff; font-size: 14px;")
+        headless_label.setObjectName("frameLabel")
         headless_layout.addWidget(headless_label)
         
         headless_layout.addStretch()
         
-        self.headless_toggle = ToggleSwitch()
+        self.headless_toggle = self.create_toggle_switch()
         self.headless_toggle.toggled.connect(lambda checked: None)
         headless_layout.addWidget(self.headless_toggle)
         
         layout.addWidget(headless_frame)
         
+        # ===== 実行ログ =====
+        layout.addWidget(self.create_section_header("実行ログ"))
+        
+        self.progress_label = QLabel("進捗: -")
+        self.progress_label.setObjectName("fieldLabel")
+        layout.addWidget(self.progress_label)
+        
+        self.log_view = QPlainTextEdit()
+        self.log_view.setObjectName("logView")
+        self.log_view.setReadOnly(True)
+        self.log_view.setMaximumBlockCount(self.LOG_MAX_LINES)
+        self.log_view.setFixedHeight(200)
+        layout.addWidget(self.log_view)
+        
         # ===== ボタンエリア =====
         button_container = QWidget()
         button_layout = QHBoxLayout(button_container)
@@ -750,46 +884,14 @@ class LineAutomationApp(QMainWindow):
         self.run_button = QPushButton("実行")
         self.run_button.setFixedHeight(48)
         self.run_button.setMinimumWidth(120)
-        self.run_button.setStyleSheet("""
-            QPushButton {
-                background-color: #00d4aa;
-                color: #0f0f0f;
-                font-size: 15px;
-                font-weight: bold;
-                border: none;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: #00f5c4;
-            }
-            QPushButton:disabled {
-                background-color: #333333;
-                color: #666666;
-            }
-        """)
+        self.run_button.setObjectName("runButton")
         self.run_button.clicked.connect(self.on_run_click)
         button_layout.addWidget(self.run_button)
         
         self.pause_button = QPushButton("一時停止")
         self.pause_button.setFixedHeight(48)
         self.pause_button.setMinimumWidth(120)
-        self.pause_button.setStyleSheet("""
-            QPushButton {
-                background-color: #ff6b35;
-                color: #ffffff;
-                font-size: 15px;
-                font-weight: bold;
-                border: none;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: #ff8c5a;
-            }
-            QPushButton:disabled {
-                background-color: #333333;
-                color: #666666;
-            }
-        """)
+        self.pause_button.setObjectName("pauseButton")
         self.pause_button.setEnabled(False)
         self.pause_button.clicked.connect(self.on_pause_click)
         button_layout.addWidget(self.pause_button)
@@ -799,20 +901,7 @@ class LineAutomationApp(QMainWindow):
         self.save_button = QPushButton("設定を保存")
         self.save_button.setFixedHeight(48)
         self.save_button.setMinimumWidth(120)
-        self.save_button.setStyleSheet("""
-            QPushButton {
-                background-color: #242424;
-                color: #ffffff;
-                font-size: 15px;
-                font-weight: bold;
-                border: 1px solid #444444;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: #333333;
-                border-color: #555555;
-            }
-        """)
+        self.save_button.setObjectName("saveButton")
         self.save_button.clicked.connect(self.on_save_click)
         button_layout.addWidget(self.save_button)
         
@@ -829,18 +918,18 @@ class LineAutomationApp(QMainWindow):
         layout.setAlignment(Qt.AlignCenter)
         
         icon = QLabel("🚧")
-        icon.setFont(QFont("", 64))
+        icon.setFont(_ui_font(64))
         icon.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon)
         
         title = QLabel("開発中")
-        title.setFont(QFont("", 24, QFont.Bold))
-        title.setStyleSheet("color: #a0a0a0;")
+        title.setFont(_ui_font(24, bold=True))
+        title.setObjectName("prolineTitle")
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
         
         desc = QLabel("この機能は現在開発中です")
-        desc.setStyleSheet("color: #a0a0a0; font-size: 14px;")
+        desc.setObjectName("fieldLabel")
         desc.setAlignment(Qt.AlignCenter)
         layout.addWidget(desc)
         
@@ -852,106 +941,121 @@ class LineAutomationApp(QMainWindow):
         url = self.sheet_url_input.text().strip()
         print(f"[DEBUG] URL: {url}")
         
-        if not url:
+        # 変更をまとめて1回の再描画で反映する
+        self.sheet_name_combo.setUpdatesEnabled(False)
+        try:
             self.sheet_name_combo.clear()
-            self.sheet_name_combo.addItem("シートURLを入力してください")
+            self.sheet_name_combo.addItem("読み込み中..." if url else "シートURLを入力してください")
             self.sheet_name_combo.setEnabled(False)
-            return
+        finally:
+            self.sheet_name_combo.setUpdatesEnabled(True)
         
-        self.sheet_name_combo.clear()
-        self.sheet_name_combo.addItem("読み込み中...")
-        self.sheet_name_combo.setEnabled(False)
+        # 連続で編集された場合は最新のリクエストの結果だけを反映する
+        self._sheet_req_id += 1
+        req_id = self._sheet_req_id
+        
+        if not url:
+            return
         
         def fetch():
             print(f"[DEBUG] シート取得開始: {url}")
             try:
                 sheet_names, error = self.sheets_client.get_sheet_names(url)
                 print(f"[DEBUG] シート取得結果: names={sheet_names}, error={error}")
-                # シグナルでメインスレッドに通知
-                self.worker_signals.sheet_names_loaded.emit(sheet_names, error)
             except Exception as e:
                 print(f"[DEBUG] シート取得エラー: {e}")
-                self.worker_signals.sheet_names_loaded.emit([], str(e))
+                sheet_names, error = [], str(e)
+            
+            # 古いリクエストの結果は破棄
+            if req_id != self._sheet_req_id:
+                return
+            # シグナルでメインスレッドに通知
+            self.worker_signals.sheet_names_loaded.emit(sheet_names, error)
         
-        threading.Thread(target=fetch, daemon=True).start()
+        self._pool.start(FunctionRunnable(fetch))
     
     def _on_sheet_names_loaded(self, sheet_names, error):
         """シート名取得完了時のスロット（メインスレッド）"""
         print(f"[DEBUG] _on_sheet_names_loaded: names={len(sheet_names) if sheet_names else 0}, error={error}")
         
-        self.sheet_name_combo.clear()
+        # 変更をまとめて1回の再描画で反映する
+        self.sheet_name_combo.setUpdatesEnabled(False)
+        try:
+            self.sheet_name_combo.clear()
+            self._sheet_index = {}
+            
+            if error:
+                self.sheet_name_combo.addItem("エラー")
+                self.sheet_name_combo.setEnabled(False)
+            else:
+                self.sheet_name_combo.addItems(sheet_names)
+                self.sheet_name_combo.setEnabled(True)
+                self._sheet_index = {name: i for i, name in enumerate(sheet_names)}
+                
+                # 保存されていたシート名があれば選択
+                if self._pending_sheet_name:
+                    idx = self._sheet_index.get(self._pending_sheet_name, -1)
+                    if idx >= 0:
+                        self.sheet_name_combo.setCurrentIndex(idx)
+                    self._pending_sheet_name = None
+        finally:
+            self.sheet_name_combo.setUpdatesEnabled(True)
         
         if error:
-            self.sheet_name_combo.addItem("エラー")
-            self.sheet_name_combo.setEnabled(False)
-            QMessageBox.warning(self, "エラー", str(error))
-        else:
-            self.sheet_name_combo.addItems(sheet_names)
-            self.sheet_name_combo.setEnabled(True)
-            
-            # 保存されていたシート名があれば選択
-            if self._pending_sheet_name:
-                idx = self.sheet_name_combo.findText(self._pending_sheet_name)
-                if idx >= 0:
-                    self.sheet_name_combo.setCurrentIndex(idx)
-                self._pending_sheet_name = None
+            self._show_message(QMessageBox.Warning, "エラー", str(error))
     
     def on_run_click(self):
         """実行ボタン"""
-        errors = self.validate()
+        values = self._collect_field_values()
+        errors = self.validate(values)
         if errors:
-            QMessageBox.warning(self, "入力エラー", "\n".join(errors))
+            self._show_message(QMessageBox.Warning, "入力エラー", "\n".join(errors))
             return
         
         # アイコン保存先の確認
-        if not self.icon_path_input.text():
-            QMessageBox.warning(self, "入力エラー", "アイコン画像の保存先を選択してください")
+        if not values['icon_save_path']:
+            self._show_message(QMessageBox.Warning, "入力エラー", "アイコン画像の保存先を選択してください")
             return
         
         self.is_running = True
+        self._progress_queue.clear()
+        self._progress_timer.start()
         self.run_button.setEnabled(False)
         self.run_button.setText("実行中...")
         self.pause_button.setEnabled(True)
         
         # 設定を保存
-        self.on_save_click()
+        self._save_settings(self.collect_settings(values))
         
-        # 別スレッドで自動化を実行
+        # 自動化専用のスレッドプールで実行
         def run_automation():
-            from core.automation_runner import AutomationRunner, RunnerConfig
+            from core.automation_runner import AutomationRunner, RunnerConfig, new_event_loop
             
-            config = RunnerConfig(
-                email=self.email_input.text(),
-                password=self.password_input.text(),
-                sheet_url=self.sheet_url_input.text(),
-                sheet_name=self.sheet_name_combo.currentText(),
-                icon_save_path=self.icon_path_input.text(),
-                headless=self.headless_toggle.isChecked(),
-                biz_manager_enabled=self.biz_manager_toggle.isChecked(),
-                biz_manager_name=self.biz_manager_input.text(),
-                col_enabled=self.column_combos['enabled'].currentText(),
-                col_line_name=self.column_combos['line_name'].currentText(),
-                col_icon_image=self.column_combos['icon_image'].currentText(),
-                col_basic_id=self.column_combos['basic_id'].currentText(),
-                col_access_token=self.column_combos['access_token'].currentText(),
-                col_permission_link=self.column_combos['permission_link'].currentText(),
-                col_friend_link=self.column_combos['friend_link'].currentText(),
-                col_business_account=self.column_combos['business_account'].currentText(),
-            )
+            # ウィジェットの値はメインスレッドで読み取り済みのものを使う
+            run_values = dict(values)
+            run_values['headless'] = run_values.pop('headless_mode')
+            config = RunnerConfig(**run_values)
             
-            # CAPTCHA待機用のイベントを作成（スレッド間通信）
-            loop = asyncio.new_event_loop()
+            # イベントループとCAPTCHA待機用のイベントは初回だけ作成（メインスレッドからcall_soon_threadsafeでセット）
+            if self._captcha_loop is None:
+                self._captcha_loop = new_event_loop()
+                self._captcha_event = asyncio.Event()
+                self._captcha_lock = asyncio.Lock()
+            loop = self._captcha_loop
             asyncio.set_event_loop(loop)
-            self._captcha_event = threading.Event()
             
             async def captcha_callback():
                 """CAPTCHA検知時に呼ばれるコールバック"""
-                # メインスレッドにシグナルを送信
-                self.worker_signals.captcha_required.emit()
-                # ユーザーがダイアログで「完了」を押すまで待機（ポーリング）
-                while not self._captcha_event.is_set():
-                    await asyncio.sleep(0.5)
-                self._captcha_event.clear()
+                # 複数のコンテキストで同時に検知しても、ダイアログは1つずつ表示して1回の「完了」で1件だけ再開する
+                async with self._captcha_lock:
+                    if self.automation_runner.should_stop:
+                        return
+                    # 以前の通知（待機者がいないときのセットなど）は待機の前に破棄
+                    self._captcha_event.clear()
+                    # メインスレッドにシグナルを送信
+                    self.worker_signals.captcha_required.emit()
+                    # ユーザーがダイアログで「完了」を押すまで待機
+                    await self._captcha_event.wait()
             
             self.automation_runner = AutomationRunner(
                 config=config,
@@ -961,45 +1065,74 @@ class LineAutomationApp(QMainWindow):
             )
             
             try:
-                results = loop.run_until_complete(self.automation_runner.run())
-                self._on_automation_complete(results)
+                loop.run_until_complete(self.automation_runner.run())
             finally:
-                loop.close()
+                # シグナルでメインスレッドに完了を通知
+                self.worker_signals.automation_finished.emit()
         
-        self.automation_thread = threading.Thread(target=run_automation, daemon=True)
-        self.automation_thread.start()
+        self.automation_worker = FunctionRunnable(run_automation)
+        self._automation_pool.start(self.automation_worker)
     
     def _on_captcha_required(self):
         """CAPTCHAが必要なとき（メインスレッドで呼ばれる）"""
         dialog = CaptchaDialog(self)
-        result = dialog.exec()
-        
-        if result == QDialog.Accepted:
-            # ユーザーが「認証完了」を押した
-            if self._captcha_event:
-                self._captcha_event.set()
+        # ユーザーが「認証完了」を押したら解決シグナルを送る
+        dialog.accepted.connect(self.worker_signals.captcha_resolved.emit)
+        dialog.exec()
+    
+    def _on_captcha_resolved(self):
+        """CAPTCHA解決時（自動化スレッドのループ上で待機中のイベントをセット）"""
+        if self._captcha_event and self._captcha_loop:
+            self._captcha_loop.call_soon_threadsafe(self._captcha_event.set)
     
     def _log_status(self, message: str):
-        """ステータスログ（スレッドセーフ）"""
-        print(message)  # コンソールに出力
+        """ステータスログ（スレッドセーフ、メインスレッドのログ表示へ送る）"""
+        self.worker_signals.log_message.emit(message)
     
     def _update_progress(self, current: int, total: int):
-        """進捗更新"""
-        print(f"進捗: {current}/{total}")
+        """進捗更新（自動化スレッドからキューに積むだけ）"""
+        self._progress_queue.append((current, total))
+    
+    def _append_log(self, message: str):
+        """ログをバッファに追加（メインスレッド）"""
+        self._log_buffer.append(message)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+    
+    def _flush_log(self):
+        """溜まったログをまとめて表示（メインスレッド）"""
+        if not self._log_buffer:
+            return
+        self.log_view.appendPlainText("\n".join(self._log_buffer))
+        self._log_buffer = []
     
-    def _on_automation_complete(self, results):
-        """自動化完了時のコールバック"""
-        # シグナルでメインスレッドに通知
-        self.worker_signals.automation_finished.emit()
+    def _drain_progress(self):
+        """キューに溜まった進捗のうち最新のものだけを表示（メインスレッド）"""
+        latest = None
+        while self._progress_queue:
+            latest = self._progress_queue.popleft()
+        if latest is not None:
+            current, total = latest
+            self.progress_label.setText(f"進捗: {current}/{total}")
     
     def _finish_automation(self):
         """自動化完了後のUI更新"""
+        self._progress_timer.stop()
+        self._drain_progress()
         self.is_running = False
         self.run_button.setEnabled(True)
         self.run_button.setText("実行")
         self.pause_button.setEnabled(False)
         self.pause_button.setText("一時停止")
-        QMessageBox.information(self, "完了", "処理が完了しました")
+        self._show_message(QMessageBox.Information, "完了", "処理が完了しました")
+    
+    def closeEvent(self, event):
+        """ウィンドウを閉じるとき（実行中の自動化に停止を要求し、一定時間だけ終了を待つ）"""
+        if self.is_running and self.automation_runner:
+            self.automation_runner.stop()
+            self._on_captcha_resolved()  # CAPTCHA待機中でも停止できるよう待機を解除
+        self._automation_pool.waitForDone(self.CLOSE_WAIT_TIMEOUT_MS)
+        super().closeEvent(event)
     
     def on_pause_click(self):
         """一時停止ボタン"""
@@ -1021,7 +1154,6 @@ class LineAutomationApp(QMainWindow):
     
     def on_select_icon_path(self):
         """アイコン画像保存先フォルダを選択"""
-        from PySide6.QtWidgets import QFileDialog
         folder = QFileDialog.getExistingDirectory(
             self, 
             "アイコン画像の保存先を選択",
@@ -1032,46 +1164,36 @@ class LineAutomationApp(QMainWindow):
     
     def on_save_click(self):
         """設定保存ボタン"""
-        settings = self.collect_settings()
+        self._save_settings(self.collect_settings())
+    
+    def _save_settings(self, settings: LineSettings):
+        """設定を保存して結果を表示"""
         if self.settings_manager.save(AppSettings(line_settings=settings)):
-            QMessageBox.information(self, "保存完了", "設定を保存しました")
+            self._show_message(QMessageBox.Information, "保存完了", "設定を保存しました")
         else:
-            QMessageBox.warning(self, "エラー", "設定の保存に失敗しました")
+            self._show_message(QMessageBox.Warning, "エラー", "設定の保存に失敗しました")
     
-    def validate(self) -> List[str]:
+    def validate(self, values: Optional[dict] = None) -> List[str]:
         """バリデーション"""
+        if values is None:
+            values = self._collect_field_values()
+        
         errors = []
-        if not self.email_input.text():
+        if not values['email']:
             errors.append("メールアドレスを入力してください")
-        if not self.password_input.text():
+        if not values['password']:
             errors.append("パスワードを入力してください")
-        if not self.sheet_url_input.text():
+        if not values['sheet_url']:
             errors.append("連携先シートURLを入力してください")
-        sheet_val = self.sheet_name_combo.currentText()
-        if sheet_val in ["シートURLを入力してください", "読み込み中...", "エラー", ""]:
+        if values['sheet_name'] in ["シートURLを入力してください", "読み込み中...", "エラー", ""]:
             errors.append("使用シート名を選択してください")
         return errors
     
-    def collect_settings(self) -> LineSettings:
+    def collect_settings(self, values: Optional[dict] = None) -> LineSettings:
         """設定収集"""
-        return LineSettings(
-            email=self.email_input.text(),
-            password=self.password_input.text(),
-            sheet_url=self.sheet_url_input.text(),
-            sheet_name=self.sheet_name_combo.currentText(),
-            col_enabled=self.column_combos['enabled'].currentText(),
-            col_line_name=self.column_combos['line_name'].currentText(),
-            col_icon_image=self.column_combos['icon_image'].currentText(),
-            col_basic_id=self.column_combos['basic_id'].currentText(),
-            col_access_token=self.column_combos['access_token'].currentText(),
-            col_permission_link=self.column_combos['permission_link'].currentText(),
-            col_friend_link=self.column_combos['friend_link'].currentText(),
-            col_business_account=self.column_combos['business_account'].currentText(),
-            icon_save_path=self.icon_path_input.text(),
-            biz_manager_enabled=self.biz_manager_toggle.isChecked(),
-            biz_manager_name=self.biz_manager_input.text(),
-            headless_mode=self.headless_toggle.isChecked(),
-        )
+        if values is None:
+            values = self._collect_field_values()
+        return LineSettings(**values)
     
     def load_settings(self):
         """設定読み込み"""
@@ -1090,7 +1212,7 @@ class LineAutomationApp(QMainWindow):
         for key, combo in self.column_combos.items():
             value = getattr(line, f"col_{key}", "")
             if value:
-                idx = combo.findText(value)
+                idx = self._combo_text_index[key].get(value, -1)
                 if idx >= 0:
                     combo.setCurrentIndex(idx)
         
@@ -1106,6 +1228,8 @@ class LineAutomationApp(QMainWindow):
 def main():
     """アプリケーション起動"""
     app = QApplication(sys.argv)
+    # スタイルシートはウィンドウ生成前にアプリ全体へ1回だけ適用する
+    app.setStyleSheet(DARK_STYLE)
     window = LineAutomationApp()
     window.show()
     sys.exit(app.exec())